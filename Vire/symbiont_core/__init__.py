@@ -1 +1 @@
-﻿"""symbiont_core package init."""
+﻿"""symbiont_core package init."""
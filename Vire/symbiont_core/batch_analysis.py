@@ -0,0 +1,166 @@
+"""
+Batch position analysis over an EnginePool.
+
+Positions come from a FEN list (one per line, `#` comments allowed) or a
+PGN file (every position of every game). Transpositions are analysed
+once: positions are keyed by `position_key` (the FEN without move
+clocks). Input is read lazily into a bounded window of work that fans
+out over the pool's engines; results are yielded, and appended to a
+JSONL file, in completion order. With an EvalCache,
+positions already searched deep enough are answered without an engine.
+"""
+import json
+import pathlib
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+import chess
+import chess.engine
+import chess.pgn
+
+from symbiont_core.eval_cache import position_key
+
+
+def iter_positions(path):
+    """Yield FENs from a .pgn file (all positions of all games) or a FEN list."""
+    path = pathlib.Path(path)
+    if path.suffix.lower() == ".pgn":
+        with open(path, encoding="utf-8-sig", errors="replace") as f:
+            while True:
+                game = chess.pgn.read_game(f)
+                if game is None:
+                    break
+                board = game.board()
+                yield board.fen()
+                for move in game.mainline_moves():
+                    board.push(move)
+                    yield board.fen()
+    else:
+        with open(path, encoding="utf-8-sig") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line
+
+
+def score_dict(info):
+    """Engine score from White's point of view as {"cp": …, "mate": …}."""
+    score = info.get("score")
+    if score is None:
+        return {"cp": None, "mate": None}
+    white = score.white()
+    return {"cp": white.score(), "mate": white.mate()}
+
+
+def engine_lines(infos):
+    """python-chess analysis infos as JSON-able [{"cp", "mate", "pv", "depth"}] (EvalCache format)."""
+    return [{**score_dict(info), "pv": [m.uci() for m in info.get("pv", [])],
+             "depth": info.get("depth")} for info in infos]
+
+
+def _result(fen, depth, multipv, lines, seconds):
+    return {"fen": fen, "key": position_key(fen), "depth": depth, "multipv": multipv,
+            "best": lines[0]["pv"][0] if lines and lines[0]["pv"] else None,
+            "lines": lines, "seconds": round(seconds, 4)}
+
+
+def _analyse_one(pool, fen, depth, multipv):
+    started = time.perf_counter()
+    infos = pool.analyse(chess.Board(fen), chess.engine.Limit(depth=depth), multipv=multipv)
+    return _result(fen, depth, multipv, engine_lines(infos), time.perf_counter() - started)
+
+
+class BatchReport:
+    def __init__(self):
+        self.positions  = 0     # positions read
+        self.unique     = 0     # after transposition dedupe
+        self.analysed   = 0
+        self.failed     = 0
+        self.cached     = 0     # answered from the EvalCache
+        self.seconds    = 0.0
+
+    @property
+    def rate(self):
+        return self.analysed / self.seconds if self.seconds else 0.0
+
+
+def analyse_batch(pool, fens, depth=12, multipv=1, out_path=None, workers=None, report=None,
+                  analyse=_analyse_one, cache=None):
+    """
+    Analyse `fens` on `pool`, yielding result dicts as they finish (each
+    with "count": how many input positions read so far it stands for).
+    Failures are yielded as {"fen", "key", "error"}. `fens` is consumed
+    lazily, at most two positions per worker in flight, so results
+    stream while a large PGN is still being read. With `out_path` every
+    result is also appended to that JSONL file as it arrives. `report`
+    (a BatchReport) is filled in along the way. With `cache` (an
+    EvalCache) cached positions are yielded as they are read, marked
+    "cached", and new results are stored in it.
+    """
+    report = report if report is not None else BatchReport()
+    workers = workers or pool.size
+    window = 2 * workers
+    counts = {}
+
+    out = None
+    if out_path:
+        out_path = pathlib.Path(out_path)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out = open(out_path, "a", encoding="utf-8")
+    def emit(result):
+        result["count"] = counts[result["key"]]
+        report.seconds = time.perf_counter() - started
+        if out:
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+        return result
+
+    def finish(future):
+        key, fen = inflight.pop(future)
+        try:
+            result = future.result()
+            report.analysed += 1
+        except Exception as e:
+            result = {"fen": fen, "key": key, "error": str(e) or e.__class__.__name__}
+            report.failed += 1
+        else:
+            if cache is not None:
+                cache.put(result["fen"], depth, multipv, result["lines"])
+        return emit(result)
+
+    started = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    inflight = {}
+    try:
+        for fen in fens:
+            key = position_key(fen)
+            report.positions += 1
+            if key in counts:
+                counts[key] += 1
+                continue
+            counts[key] = 1
+            report.unique += 1
+
+            lines = cache.get(fen, depth, multipv) if cache is not None else None
+            if lines is not None:
+                report.analysed += 1
+                report.cached += 1
+                yield emit({**_result(fen, depth, multipv, lines, 0.0), "cached": True})
+                continue
+
+            inflight[executor.submit(analyse, pool, fen, depth, multipv)] = (key, fen)
+            if len(inflight) >= window:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield finish(future)
+
+        for future in as_completed(list(inflight)):
+            yield finish(future)
+    finally:
+        # a consumer that stops early (Ctrl-C, break) drops the queued positions
+        for future in inflight:
+            future.cancel()
+        executor.shutdown()
+        report.seconds = time.perf_counter() - started
+        if out:
+            out.close()
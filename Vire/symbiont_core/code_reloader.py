@@ -0,0 +1,61 @@
+import importlib
+import os
+import pathlib
+import sys
+import traceback
+
+from symbiont_core.watcher import ChangeWatcher
+
+
+def modules_for(paths):
+    """Loaded modules whose source file is one of `paths`, parents before children."""
+    wanted = {os.path.normcase(os.path.realpath(p)) for p in paths}
+    found = []
+    for name, module in list(sys.modules.items()):
+        source = getattr(module, "__file__", None)
+        if source and os.path.normcase(os.path.realpath(source)) in wanted:
+            found.append((name, module))
+    return [module for _, module in sorted(found, key=lambda item: item[0])]
+
+
+class CodeReloader:
+    """
+    Reloads only the code that changed while the program runs.
+
+    A ChangeWatcher (watchdog, or a polling thread) reports edited *.py
+    files under `root`. `check()` — cheap when nothing changed — reloads
+    each changed module that is already imported and hands changed
+    *.plugin.py files (added, edited or deleted) to `reload_plugin(path)`.
+    Failures are reported and skipped; a plugin that fails to import
+    keeps its previous commands.
+    """
+
+    def __init__(self, root, reload_plugin, interval=1.0):
+        self.root          = pathlib.Path(root)
+        self.reload_plugin = reload_plugin
+        self.watcher       = ChangeWatcher([self.root], suffixes=(".py",), interval=interval,
+                                           recursive=True).start()
+
+    def check(self):
+        """Reload what changed since the last call; returns the names reloaded."""
+        if not self.watcher.pending():
+            return []
+        changed = self.watcher.drain()
+        plugins = sorted(p for p in changed if p.endswith(".plugin.py"))
+        reloaded = []
+        for module in modules_for(set(changed) - set(plugins)):
+            try:
+                importlib.reload(module)
+                reloaded.append(module.__name__)
+            except Exception:
+                traceback.print_exc()
+        for path in plugins:
+            try:
+                self.reload_plugin(pathlib.Path(path))
+                reloaded.append(pathlib.Path(path).name)
+            except Exception:
+                traceback.print_exc()
+        return reloaded
+
+    def close(self):
+        self.watcher.stop()
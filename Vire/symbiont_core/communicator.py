@@ -1 +1 @@
-﻿class Communicator:\n    pass
+﻿class Communicator:\n    pass
@@ -0,0 +1,17 @@
+"""Shared access to config/settings.json."""
+import json
+import pathlib
+
+PROJECT_ROOT  = pathlib.Path(__file__).resolve().parents[1]
+SETTINGS_PATH = PROJECT_ROOT / "config" / "settings.json"
+MEMORY_ROOT   = PROJECT_ROOT.parent / "memory"
+
+def load_settings():
+    """Load settings.json (BOM tolerant); returns {} if missing or unreadable."""
+    if SETTINGS_PATH.exists():
+        try:
+            with open(SETTINGS_PATH, encoding="utf-8-sig") as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
@@ -0,0 +1,78 @@
+import os
+import pathlib
+import threading
+
+
+class DiskCache:
+    """
+    Folder of files named by key digest, trimmed to `max_bytes` by evicting
+    the least recently used file (mtime is refreshed on every hit, so the
+    order survives restarts). Values are bytes.
+    """
+
+    def __init__(self, path, max_bytes, suffix=".bin"):
+        self.path      = pathlib.Path(path)
+        self.max_bytes = max_bytes
+        self.suffix    = suffix
+        self._index    = None        # {file name: size}, oldest first
+        self._lock     = threading.Lock()
+
+    def __len__(self):
+        return len(self._files())
+
+    def _files(self):
+        if self._index is None:
+            self._index = {}
+            if self.path.exists():
+                entries = [e for e in os.scandir(self.path) if e.name.endswith(self.suffix)]
+                for entry in sorted(entries, key=lambda e: e.stat().st_mtime_ns):
+                    self._index[entry.name] = entry.stat().st_size
+        return self._index
+
+    def get(self, digest):
+        name = digest + self.suffix
+        with self._lock:
+            index = self._files()
+            if name not in index:
+                return None
+            try:
+                data = (self.path / name).read_bytes()
+            except OSError:
+                self._drop(name)
+                return None
+            index[name] = index.pop(name)        # most recently used
+        try:
+            os.utime(self.path / name)
+        except OSError:
+            pass
+        return data
+
+    def put(self, digest, data):
+        if len(data) > self.max_bytes:
+            return
+        name = digest + self.suffix
+        with self._lock:
+            index = self._files()
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmp = self.path / (name + f".{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, self.path / name)
+            index.pop(name, None)
+            index[name] = len(data)
+            total = sum(index.values())
+            while total > self.max_bytes:
+                oldest = next(iter(index))
+                total -= index[oldest]
+                self._drop(oldest)
+
+    def clear(self):
+        with self._lock:
+            for name in list(self._files()):
+                self._drop(name)
+
+    def _drop(self, name):
+        self._files().pop(name, None)
+        try:
+            (self.path / name).unlink()
+        except OSError:
+            pass
@@ -0,0 +1,164 @@
+"""
+Long-lived pool of UCI engines (Stockfish by default).
+
+Engines are started on first demand, up to `size`, and handed out one
+caller at a time; they stay alive between commands so process start-up
+and hash allocation are paid once and the transposition table is kept.
+An engine that dies mid-analysis is discarded and replaced on the next
+checkout. `factory` builds one engine and can be swapped for a stub.
+
+Settings: STOCKFISH_PATH, STOCKFISH_POOL_SIZE (default: cores / threads),
+STOCKFISH_THREADS (per engine, default 1), STOCKFISH_HASH (MB, default 64).
+"""
+import atexit
+import contextlib
+import os
+import queue
+import threading
+import time
+
+from symbiont_core.config import load_settings
+
+# Optional: python-chess provides the UCI driver; the pool itself works
+# with any engine object that has analyse() and quit().
+try:
+    import chess.engine
+    # Only a dead or unreachable process counts as a crash: EngineError is
+    # also raised for bad options or positions, where the engine is fine.
+    _CRASHES = (chess.engine.EngineTerminatedError, OSError, EOFError)
+except ImportError:
+    chess = None
+    _CRASHES = (OSError, EOFError)
+
+
+def uci_factory(path="stockfish", threads=1, hash_mb=64, options=None):
+    """Factory that launches a UCI engine with Threads/Hash (and any extra options) set."""
+    def launch():
+        if chess is None:
+            raise RuntimeError("python-chess is not installed (pip install chess)")
+        engine = chess.engine.SimpleEngine.popen_uci(path)
+        config = {"Threads": threads, "Hash": hash_mb, **(options or {})}
+        engine.configure({k: v for k, v in config.items() if k in engine.options})
+        return engine
+    return launch
+
+
+class EnginePool:
+    def __init__(self, factory, size=1):
+        self.factory  = factory
+        self.size     = max(1, size)
+        self._idle    = []                    # most recently used last: warmest hash table
+        self._lock    = threading.Lock()
+        self._freed   = threading.Condition(self._lock)   # an engine came back or a slot opened
+        self._started = 0
+        self._all     = []
+        self.restarts = 0
+        self.closed   = False
+
+    def _acquire(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._freed:
+            while True:
+                if self.closed:
+                    raise RuntimeError("engine pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._started < self.size:
+                    self._started += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._freed.wait(remaining)
+        try:
+            engine = self.factory()
+        except Exception:
+            with self._freed:
+                self._started -= 1
+                self._freed.notify()
+            raise
+        with self._lock:
+            self._all.append(engine)
+        return engine
+
+    def _release(self, engine):
+        with self._freed:
+            self._idle.append(engine)
+            self._freed.notify()
+
+    def _discard(self, engine):
+        with self._freed:
+            if engine in self._all:
+                self._all.remove(engine)
+                self._started -= 1
+            self.restarts += 1
+            self._freed.notify()        # a waiter may now start a replacement
+        with contextlib.suppress(Exception):
+            engine.close() if hasattr(engine, "close") else engine.quit()
+
+    @contextlib.contextmanager
+    def engine(self, timeout=None):
+        """Check out an engine for the duration of a `with` block (queue.Empty on timeout)."""
+        engine = self._acquire(timeout)
+        try:
+            yield engine
+        except _CRASHES:
+            self._discard(engine)
+            raise
+        except BaseException:
+            self._release(engine)
+            raise
+        else:
+            if self.closed:
+                self._discard(engine)
+            else:
+                self._release(engine)
+
+    def analyse(self, board, limit, retries=1, **kwargs):
+        """engine.analyse() on a pooled engine; retried on a fresh engine if one crashes."""
+        for attempt in range(retries + 1):
+            try:
+                with self.engine() as engine:
+                    return engine.analyse(board, limit, **kwargs)
+            except _CRASHES:
+                if attempt == retries:
+                    raise
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            engines, self._all = self._all, []
+            self._idle = []
+            self._started = 0
+            self._freed.notify_all()
+        for engine in engines:
+            with contextlib.suppress(Exception):
+                engine.quit()
+
+
+def _at_shutdown(func):
+    # SimpleEngine runs a non-daemon thread, which the interpreter joins
+    # *before* atexit handlers run; threading's own hook runs earlier.
+    register = getattr(threading, "_register_atexit", None)
+    try:
+        register(func) if register else atexit.register(func)
+    except RuntimeError:        # already shutting down
+        atexit.register(func)
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+def get_pool():
+    """Process-wide Stockfish pool configured from settings; engines quit at exit."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None or _POOL.closed:
+            settings = load_settings()
+            threads = int(settings.get("STOCKFISH_THREADS", 1))
+            size = settings.get("STOCKFISH_POOL_SIZE") or max(1, (os.cpu_count() or 1) // threads)
+            factory = uci_factory(settings.get("STOCKFISH_PATH", "stockfish"), threads,
+                                  int(settings.get("STOCKFISH_HASH", 64)))
+            _POOL = EnginePool(factory, int(size))
+            _at_shutdown(_POOL.close)
+        return _POOL
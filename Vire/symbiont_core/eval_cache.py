@@ -0,0 +1,130 @@
+"""
+Persistent chess evaluation cache.
+
+Evaluations are keyed on the position (the FEN without move clocks, so
+transpositions share an entry) and on their source ("stockfish",
+"lichess"): cloud and local scores are not interchangeable. Each row
+keeps the search depth, the number of lines (multiPV) and the lines
+themselves as compact JSON: [{"cp", "mate", "pv": [uci, …], "depth"}],
+scores from White's point of view. A lookup hits when the stored depth
+and multiPV are at least the requested ones; the least recently used
+rows are evicted past `max_entries`.
+
+Settings: EVAL_CACHE_ENTRIES (default 100000; 0 disables the cache).
+"""
+import json
+import sqlite3
+import threading
+import time
+
+from symbiont_core.config import load_settings, MEMORY_ROOT
+
+MAX_ENTRIES = 100_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evals (
+    key      TEXT    NOT NULL,
+    source   TEXT    NOT NULL,
+    depth    INTEGER NOT NULL,
+    multipv  INTEGER NOT NULL,
+    lines    TEXT    NOT NULL,
+    used     REAL    NOT NULL,
+    PRIMARY KEY (key, source)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS evals_used ON evals(used);
+"""
+
+
+def position_key(fen):
+    """FEN without the halfmove/fullmove clocks: equal for transpositions."""
+    return " ".join(fen.split()[:4])
+
+
+class EvalCache:
+    def __init__(self, path, max_entries=MAX_ENTRIES, clock=time.time):
+        self.path        = path
+        self.max_entries = max_entries
+        self.clock       = clock
+        self._lock       = threading.Lock()
+        self.hits        = 0
+        self.misses      = 0
+        if path != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._count = self.conn.execute("SELECT COUNT(*) FROM evals").fetchone()[0]
+
+    def __len__(self):
+        return self._count
+
+    def get(self, fen, depth, multipv=1, source="stockfish"):
+        """Cached lines (first `multipv` of them) searched to at least `depth`, or None."""
+        key = position_key(fen)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT depth, multipv, lines FROM evals WHERE key = ? AND source = ?",
+                (key, source)).fetchone()
+            if row is None or row[0] < depth or row[1] < multipv:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE evals SET used = ? WHERE key = ? AND source = ?",
+                              (self.clock(), key, source))
+        return json.loads(row[2])[:multipv]
+
+    def put(self, fen, depth, multipv, lines, source="stockfish"):
+        """Store an evaluation unless a deeper one (or an equally deep, wider one) is kept."""
+        body = json.dumps(lines, separators=(",", ":"))
+        key = position_key(fen)
+        with self._lock:
+            known = self.conn.execute("SELECT 1 FROM evals WHERE key = ? AND source = ?",
+                                      (key, source)).fetchone()
+            self.conn.execute(
+                "INSERT INTO evals(key, source, depth, multipv, lines, used) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key, source) DO UPDATE SET depth = excluded.depth, "
+                "multipv = excluded.multipv, lines = excluded.lines, used = excluded.used "
+                "WHERE excluded.depth > evals.depth "
+                "OR (excluded.depth = evals.depth AND excluded.multipv >= evals.multipv)",
+                (key, source, depth, multipv, body, self.clock()))
+            if not known:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        # trim to 90% so eviction runs once per batch of inserts, not on every put
+        drop = self._count - int(self.max_entries * 0.9)
+        self.conn.execute(
+            "DELETE FROM evals WHERE (key, source) IN "
+            "(SELECT key, source FROM evals ORDER BY used LIMIT ?)", (drop,))
+        self._count = self.conn.execute("SELECT COUNT(*) FROM evals").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM evals")
+            self._count = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": self._count, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+def get_eval_cache():
+    """Process-wide cache in memory/eval_cache.sqlite3, or None when disabled."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            entries = int(load_settings().get("EVAL_CACHE_ENTRIES", MAX_ENTRIES))
+            if entries <= 0:
+                return None
+            _CACHE = EvalCache(MEMORY_ROOT / "eval_cache.sqlite3", entries)
+        return _CACHE
@@ -1 +1 @@
-﻿class Mutator:\n    pass
+﻿class Mutator:\n    pass
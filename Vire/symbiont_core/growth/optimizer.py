@@ -1 +1 @@
-﻿class Optimizer:\n    pass
+﻿class Optimizer:\n    pass
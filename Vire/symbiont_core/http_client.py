@@ -0,0 +1,279 @@
+"""
+Shared HTTP client for plugins.
+
+One HttpClient is handed to every plugin at registration (see
+symbiont_core.plugins.register_plugin). It keeps idle keep-alive
+connections per host, applies default connect/read timeouts and asks for
+gzip. The network goes through a transport object, so tests can swap in
+RedirectTransport (send everything to a local stand-in server) or any
+object with the same `send()` method. Requests made with `ttl=` go
+through the client's ResponseCache. Like urlopen, PooledTransport
+honours the HTTP_PROXY / HTTPS_PROXY / NO_PROXY environment variables
+(https through a CONNECT tunnel).
+"""
+import base64
+import http.client
+import json
+import threading
+import urllib.parse
+import urllib.request
+import zlib
+
+from symbiont_core.config import load_settings, MEMORY_ROOT
+from symbiont_core.response_cache import ResponseCache
+
+USER_AGENT      = "Symbiont/1.0"
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT    = 15.0
+MAX_IDLE        = 4       # idle connections kept per host
+CACHE_DISK_MB   = 20      # default size of memory/http_cache/
+
+# errors that mean a reused keep-alive connection was closed by the server
+_STALE = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+          ConnectionResetError, BrokenPipeError)
+
+# safe to send twice; only these reuse idle connections (and retry when one was stale)
+IDEMPOTENT = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+class HttpError(Exception):
+    """Network failure or an error reported by `raise_for_status()`."""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+class HttpResponse:
+    def __init__(self, url, status, headers, body, cache_state=None):
+        self.url         = url
+        self.status      = status
+        self.headers     = headers       # lower-cased names
+        self.body        = body          # bytes, already un-gzipped
+        self.cache_state = cache_state   # None (uncached), "hit", "stale", "miss" or "error"
+
+    def text(self):
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8"))
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise HttpError(f"HTTP Error {self.status}", self.status)
+        return self
+
+
+# =========================================================
+# TRANSPORTS
+# =========================================================
+class PooledTransport:
+    """
+    http.client connections, reused per (scheme, host, port, proxy).
+    A request that is not idempotent (POST) always gets a fresh
+    connection: if a reused one turned out to be closed, there is no
+    telling whether the server already acted on it, so it is never resent.
+    """
+
+    def __init__(self, max_idle=MAX_IDLE, proxies=None):
+        self.max_idle = max_idle
+        self.proxies = urllib.request.getproxies() if proxies is None else proxies
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _proxy_for(self, scheme, host):
+        """(host, port, Proxy-Authorization or None) of the proxy for `host`, or None."""
+        proxy = self.proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        parts = urllib.parse.urlsplit(proxy if "://" in proxy else "http://" + proxy)
+        auth = None
+        if parts.username:
+            user = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+            auth = "Basic " + base64.b64encode(user.encode("utf-8")).decode("ascii")
+        return parts.hostname, parts.port or 80, auth
+
+    def _checkout(self, key, connect_timeout, reuse=True):
+        if reuse:
+            with self._lock:
+                idle = self._idle.get(key)
+                if idle:
+                    return idle.pop(), True
+        scheme, host, port, proxy = key
+        if proxy is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            return cls(host, port, timeout=connect_timeout), False
+        proxy_host, proxy_port, auth = proxy
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=connect_timeout)
+            conn.set_tunnel(host, port, headers={"Proxy-Authorization": auth} if auth else None)
+        else:
+            conn = http.client.HTTPConnection(proxy_host, proxy_port, timeout=connect_timeout)
+        return conn, False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def send(self, method, url, headers, body, timeout):
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "http"
+        proxy = self._proxy_for(scheme, parts.hostname)
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80), proxy)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        if proxy is not None and scheme == "http":
+            # a plain-http proxy takes the absolute URL
+            path = urllib.parse.urlunsplit((scheme, parts.netloc, path, "", ""))
+            if proxy[2]:
+                headers = {**headers, "Proxy-Authorization": proxy[2]}
+        connect_timeout, read_timeout = timeout
+        idempotent = method.upper() in IDEMPOTENT
+
+        while True:
+            conn, reused = self._checkout(key, connect_timeout, reuse=idempotent)
+            try:
+                if conn.sock is None:
+                    conn.timeout = connect_timeout
+                    conn.connect()
+                conn.sock.settimeout(read_timeout)
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except _STALE:
+                conn.close()
+                if reused:
+                    continue        # the server dropped an idle connection; retry on a fresh one
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            return resp.status, {k.lower(): v for k, v in resp.getheaders()}, data
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+class RedirectTransport:
+    """Send every request to `base_url` instead (path and query kept); for local stand-in servers."""
+
+    def __init__(self, base_url, inner=None):
+        self.base = urllib.parse.urlsplit(base_url)
+        self.inner = inner or PooledTransport()
+        self.requests = []          # (method, original url), for assertions
+
+    def send(self, method, url, headers, body, timeout):
+        self.requests.append((method, url))
+        parts = urllib.parse.urlsplit(url)
+        target = urllib.parse.urlunsplit((self.base.scheme, self.base.netloc,
+                                          self.base.path.rstrip("/") + parts.path,
+                                          parts.query, ""))
+        return self.inner.send(method, target, headers, body, timeout)
+
+    def close(self):
+        self.inner.close()
+
+
+# =========================================================
+# CLIENT
+# =========================================================
+class HttpClient:
+    def __init__(self, transport=None, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT, headers=None, cache=None):
+        self.transport = transport or PooledTransport()
+        self.cache     = cache
+        self.timeout   = (connect_timeout, read_timeout)
+        self.headers   = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip",
+                          "Connection": "keep-alive", **(headers or {})}
+
+    def request(self, method, url, params=None, data=None, json_body=None,
+                headers=None, timeout=None, ttl=None, stale=None):
+        """
+        Perform a request and return an HttpResponse (any status).
+        Network failures raise HttpError.
+
+        With `ttl` (seconds) and a cache, 200 responses are reused for
+        `ttl`, then served stale for another `stale` seconds (default: ttl)
+        while being refreshed in the background, and served whatever their
+        age if the network fails.
+        """
+        if params:
+            url += ("&" if "?" in url else "?") + urllib.parse.urlencode(params)
+        all_headers = {**self.headers, **(headers or {})}
+        if json_body is not None:
+            data = json.dumps(json_body).encode("utf-8")
+            all_headers.setdefault("Content-Type", "application/json")
+        if isinstance(timeout, (int, float)):
+            timeout = (timeout, timeout)
+        send = lambda: self._send(method, url, all_headers, data, timeout or self.timeout)
+        if ttl is None or self.cache is None:
+            return HttpResponse(url, *send())
+        def fetch():
+            status, resp_headers, body = send()
+            # only what callers read; cookies and the like are not cached
+            return status, {"content-type": resp_headers.get("content-type", "")}, body
+        key = ResponseCache.key(method, url, data)
+        entry, state = self.cache.fetch(key, ttl, ttl if stale is None else stale, fetch)
+        return HttpResponse(url, entry.status, entry.headers, entry.body, state)
+
+    def _send(self, method, url, headers, data, timeout):
+        try:
+            status, resp_headers, body = self.transport.send(method, url, headers, data, timeout)
+        except HttpError:
+            raise
+        except Exception as e:
+            raise HttpError(str(e) or e.__class__.__name__) from e
+        if resp_headers.get("content-encoding", "").lower() == "gzip":
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        return status, resp_headers, body
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.transport.close()
+
+
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+def get_client():
+    """
+    Process-wide client. Settings: HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT,
+    and HTTP_CACHE_DISK_MB for the response cache under memory/http_cache/.
+    """
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            settings = load_settings()
+            disk_mb = settings.get("HTTP_CACHE_DISK_MB", CACHE_DISK_MB)
+            cache = ResponseCache(disk_dir=MEMORY_ROOT / "http_cache",
+                                  max_bytes=int(disk_mb * 1024 * 1024))
+            _CLIENT = HttpClient(connect_timeout=settings.get("HTTP_CONNECT_TIMEOUT", CONNECT_TIMEOUT),
+                                 read_timeout=settings.get("HTTP_READ_TIMEOUT", READ_TIMEOUT),
+                                 cache=cache)
+        return _CLIENT
+
+def current_client():
+    """The process-wide client if get_client() has run, else None; never creates one."""
+    return _CLIENT
+
+def cache_ttl(plugin, default):
+    """A plugin's response TTL in seconds; override per plugin with HTTP_CACHE_TTL in settings."""
+    return load_settings().get("HTTP_CACHE_TTL", {}).get(plugin, default)
@@ -1 +1 @@
-﻿
+﻿
@@ -0,0 +1,200 @@
+"""
+Background jobs for the live chat REPL.
+
+JobRunner keeps an asyncio event loop in a daemon thread. Every command
+becomes a task on it: coroutine commands run on the loop itself, plain
+ones on the loop's thread pool (run_in_executor), so slow network or
+simulation commands never block the prompt. Cancelling a job cancels its
+task, so it ends at once; a thread job is stopped cooperatively: it
+raises JobCancelled at its next check_cancelled(), and every write to
+the job's output is such a check. Nothing is injected into the thread
+asynchronously, so a cancel never lands inside a file write or a held lock.
+
+ThreadOutput replaces sys.stdout / sys.stderr: text written by a job
+with a sink (a background job) goes to that sink, everything else to
+the terminal; `announce()` prints above a pending prompt and redraws it.
+"""
+import asyncio
+import contextvars
+import functools
+import io
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    import readline
+except ImportError:
+    readline = None
+
+_SINK = contextvars.ContextVar("job_output", default=None)
+_JOB  = contextvars.ContextVar("job", default=None)
+
+
+def is_async(func):
+    """True for commands written as coroutines (run on the loop instead of a thread)."""
+    return asyncio.iscoroutinefunction(func)
+
+
+class JobCancelled(BaseException):
+    """Raised inside a cancelled job (BaseException, so `except Exception` in commands lets it through)."""
+
+
+def check_cancelled():
+    """Raise JobCancelled if the job running this code was cancelled; long loops should call it."""
+    job = _JOB.get()
+    if job is not None and job.state == "cancelled":
+        raise JobCancelled()
+
+
+# =========================================================
+# OUTPUT
+# =========================================================
+class ThreadOutput:
+    """Stream proxy that sends each job's writes to its own sink."""
+
+    def __init__(self, stream, lock=None):
+        self.stream = stream
+        self.lock   = lock or threading.RLock()
+        self.prompt = None          # set while the main thread waits in input()
+
+    def write(self, text):
+        check_cancelled()           # a cancelled job stops at its next output
+        sink = _SINK.get()
+        if sink is not None:
+            return sink.write(text)
+        with self.lock:
+            return self.stream.write(text)
+
+    def flush(self):
+        if _SINK.get() is None:
+            with self.lock:
+                self.stream.flush()
+
+    def announce(self, text):
+        """Write `text` for the user now; if a prompt is showing, print above it and redraw it."""
+        with self.lock:
+            if self.prompt is None:
+                self.stream.write(text)
+            else:
+                typed = readline.get_line_buffer() if readline else ""
+                clear = "\r\x1b[K" if self.stream.isatty() else "\n"
+                self.stream.write(clear + text + self.prompt + typed)
+            self.stream.flush()
+
+    def __getattr__(self, name):    # encoding, isatty, fileno, …
+        return getattr(self.stream, name)
+
+
+# =========================================================
+# JOBS
+# =========================================================
+class Job:
+    def __init__(self, job_id, line, background):
+        self.id         = job_id
+        self.line       = line
+        self.background = background
+        self.output     = io.StringIO() if background else None
+        self.state      = "running"     # then "done", "failed" or "cancelled"
+        self.result     = None
+        self.error      = None
+        self.started    = time.perf_counter()
+        self.finished   = None
+        self.future     = None          # concurrent.futures.Future of the task
+        self.task       = None
+
+    @property
+    def seconds(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def wait(self, timeout=None):
+        """Block until the job has finished (True) or `timeout` passed (False)."""
+        return bool(wait([self.future], timeout).done)
+
+
+class JobRunner:
+    def __init__(self, workers=4, on_finish=None):
+        self.on_finish = on_finish          # called with each finished job (loop thread)
+        self.jobs      = {}                 # id -> running Job
+        self._ids      = itertools.count(1)
+        self._lock     = threading.Lock()
+        self.pool      = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self.loop      = asyncio.new_event_loop()
+        self.loop.set_default_executor(self.pool)
+        threading.Thread(target=self.loop.run_forever, name="job-loop", daemon=True).start()
+
+    def create(self, line, background=False):
+        """A new Job with its id, not scheduled yet (see start)."""
+        job = Job(next(self._ids), line, background)
+        with self._lock:
+            self.jobs[job.id] = job
+        return job
+
+    def start(self, job, target):
+        """Schedule `target()` (a function, or a coroutine function) as `job`."""
+        job.future = asyncio.run_coroutine_threadsafe(self._run(job, target), self.loop)
+        return job
+
+    def submit(self, line, target, background=False):
+        """Start `target()` as a new job; returns the Job."""
+        return self.start(self.create(line, background), target)
+
+    async def _run(self, job, target):
+        job.task = asyncio.current_task()
+        _SINK.set(job.output)       # this task's context, copied to the worker thread below
+        _JOB.set(job)
+        try:
+            if job.state != "running":              # cancelled before it started
+                raise JobCancelled()
+            if asyncio.iscoroutinefunction(target):
+                job.result = await target()
+            else:
+                context = contextvars.copy_context()
+                job.result = await self.loop.run_in_executor(
+                    None, functools.partial(context.run, self._in_thread, job, target))
+            job.state = "done"
+        except (asyncio.CancelledError, JobCancelled):
+            job.state = "cancelled"
+        except BaseException as e:
+            job.state, job.error = "failed", str(e) or e.__class__.__name__
+            if job.output is not None:
+                job.output.write(traceback.format_exc())
+        finally:
+            job.finished = time.perf_counter()
+            with self._lock:
+                self.jobs.pop(job.id, None)
+        if self.on_finish:
+            self.on_finish(job)
+        return job
+
+    @staticmethod
+    def _in_thread(job, target):
+        check_cancelled()           # cancelled while it waited for a worker
+        return target()
+
+    def cancel(self, job_id):
+        """
+        Cancel a running job; False if there is no such job. The job ends
+        now; a thread job's worker stops at its next check_cancelled().
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.state != "running":
+                return False
+            job.state = "cancelled"
+        if job.task is not None:
+            self.loop.call_soon_threadsafe(job.task.cancel)
+        return True
+
+    def running(self):
+        with self._lock:
+            return sorted(self.jobs.values(), key=lambda j: j.id)
+
+    def shutdown(self):
+        """Cancel every job and stop the loop."""
+        for job in self.running():
+            self.cancel(job.id)
+        self.pool.shutdown(wait=False)
+        self.loop.call_soon_threadsafe(self.loop.stop)
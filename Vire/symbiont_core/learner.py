@@ -1,47 +1,117 @@
-﻿import pathlib
-
-class Learner:
-    """Symbiont's learning module: loads and digests inputs."""
-
-    def __init__(self, inputs_path=None):
-        if inputs_path:
-            self.inputs_path = pathlib.Path(inputs_path)
-        else:
-            self.inputs_path = pathlib.Path(__file__).resolve().parents[1] / 'memory' / 'inputs'
-
-    def list_inputs(self):
-        """List all available learning files."""
-        return list(self.inputs_path.glob('*.txt'))
-
-    def load_input(self, filename):
-        """Load a specific input file as text."""
-        file_path = self.inputs_path / filename
-        if file_path.exists():
-            try:
-                text = file_path.read_text(encoding='utf-8')
-                if not text.strip():
-                    print(f"⚠️ Warning: {filename} is empty or unreadable.")
-                    return None
-                return text
-            except Exception as e:
-                print(f"❌ Failed reading {filename}: {e}")
-                return None
-        else:
-            print(f"❌ File {filename} does not exist.")
-            return None
-
-    def summarize(self, text):
-        """Basic digest: summarize the input to main ideas."""
-        if not text:
-            print(f"⚠️ Empty text received for summarization.")
-            return []
-
-        lines = text.splitlines()
-        # Allow shorter lines (drop strict >30 rule)
-        keypoints = [line.strip() for line in lines if line.strip()]
-
-        if not keypoints:
-            print(f"⚠️ No usable content found after cleaning lines.")
-            return []
-
-        return keypoints[:5]  # crude first digest: top 5 lines
+﻿import pathlib
+
+SUMMARY_POINTS = 5          # lines kept by the crude digest
+CHUNK_CHARS    = 1 << 20    # chunked mode: ~1M characters per chunk
+
+class Learner:
+    """Symbiont's learning module: loads and digests inputs."""
+
+    def __init__(self, inputs_path=None):
+        if inputs_path:
+            self.inputs_path = pathlib.Path(inputs_path)
+        else:
+            self.inputs_path = pathlib.Path(__file__).resolve().parents[1] / 'memory' / 'inputs'
+
+    def list_inputs(self):
+        """List all available learning files."""
+        return list(self.inputs_path.glob('*.txt'))
+
+    def load_input(self, filename):
+        """Load a specific input file as text."""
+        file_path = self.inputs_path / filename
+        if file_path.exists():
+            try:
+                text = file_path.read_text(encoding='utf-8')
+                if not text.strip():
+                    print(f"⚠️ Warning: {filename} is empty or unreadable.")
+                    return None
+                return text
+            except Exception as e:
+                print(f"❌ Failed reading {filename}: {e}")
+                return None
+        else:
+            print(f"❌ File {filename} does not exist.")
+            return None
+
+    def summarize(self, text):
+        """Basic digest: summarize the input to main ideas."""
+        if not text:
+            print(f"⚠️ Empty text received for summarization.")
+            return []
+
+        lines = text.splitlines()
+        # Allow shorter lines (drop strict >30 rule)
+        keypoints = [line.strip() for line in lines if line.strip()]
+
+        if not keypoints:
+            print(f"⚠️ No usable content found after cleaning lines.")
+            return []
+
+        return keypoints[:SUMMARY_POINTS]  # crude first digest: top 5 lines
+
+    # =========================================================
+    # STREAMING
+    # =========================================================
+    def iter_lines(self, filename):
+        """Yield the lines of an input lazily (buffered read, decoded as it goes)."""
+        file_path = self.inputs_path / filename
+        if not file_path.exists():
+            print(f"❌ File {filename} does not exist.")
+            return
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                yield from f
+        except Exception as e:
+            print(f"❌ Failed reading {filename}: {e}")
+
+    def summarize_file(self, filename, max_points=SUMMARY_POINTS):
+        """
+        Same digest as load_input + summarize, but streams the file and stops
+        after the first `max_points` non-empty lines. Returns None (like
+        load_input) when the file is missing, unreadable or blank.
+        """
+        file_path = self.inputs_path / filename
+        if not file_path.exists():
+            print(f"❌ File {filename} does not exist.")
+            return None
+        keypoints = []
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        keypoints.append(line.strip())
+                        if len(keypoints) >= max_points:
+                            break
+        except Exception as e:
+            print(f"❌ Failed reading {filename}: {e}")
+            return None
+        if not keypoints:
+            print(f"⚠️ Warning: {filename} is empty or unreadable.")
+            return None
+        return keypoints
+
+    def iter_chunks(self, filename, chunk_chars=CHUNK_CHARS):
+        """Yield the input as text chunks of about `chunk_chars`, split on line boundaries."""
+        chunk, size = [], 0
+        for line in self.iter_lines(filename):
+            chunk.append(line)
+            size += len(line)
+            if size >= chunk_chars:
+                yield "".join(chunk)
+                chunk, size = [], 0
+        if chunk:
+            yield "".join(chunk)
+
+    def summarize_chunked(self, filename, summarizer=None, combine=None, chunk_chars=CHUNK_CHARS):
+        """
+        Whole-document summary with bounded memory: `summarizer(chunk)` runs
+        on each chunk and `combine(partial, points)` folds the results, so
+        only one chunk and the running summary are held at a time. Defaults
+        reduce with `summarize` itself.
+        """
+        summarizer = summarizer or self.summarize
+        combine = combine or (lambda partial, points: self.summarize("\n".join(partial + points)))
+        partial = []
+        for chunk in self.iter_chunks(filename, chunk_chars):
+            partial = combine(partial, summarizer(chunk) or [])
+        return partial
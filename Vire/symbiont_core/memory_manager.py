@@ -1,133 +1,158 @@
-import pathlib
-import json
-
-class MemoryManager:
-    def __init__(self):
-        # --- Initialization ---
-        self.embeddings_path = pathlib.Path(__file__).resolve().parents[2] / "memory" / "embeddings"
-        self.reflections_path = pathlib.Path(__file__).resolve().parents[2] / "memory" / "reflections"
-        self.trees_path = pathlib.Path(__file__).resolve().parents[2] / "memory" / "trees"
-        self.embeddings_path.mkdir(parents=True, exist_ok=True)
-        self.reflections_path.mkdir(parents=True, exist_ok=True)
-        self.trees_path.mkdir(parents=True, exist_ok=True)
-
-    # =========================================================
-    # SUMMARY MANAGEMENT
-    # =========================================================
-    def save_summary(self, filename, summary, tags=None):
-        """Save a single summary with optional tags to the embeddings folder."""
-        data = {
-            "tags": tags or [],
-            "points": summary
-        }
-        file_path = self.embeddings_path / f"{filename}_summary.json"
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
-    def load_summary(self, filename):
-        """Load a specific summary from the embeddings folder."""
-        file_path = self.embeddings_path / f"{filename}_summary.json"
-        if file_path.exists():
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return None
-
-    def load_all_summaries(self):
-        """Load all summaries from the embeddings folder."""
-        summary_files = self.embeddings_path.glob("*_summary.json")
-        summaries = {}
-        for file in summary_files:
-            topic = file.stem.replace("_summary", "")
-            with open(file, "r", encoding="utf-8") as f:
-                summaries[topic] = json.load(f)
-        return summaries
-
-    # =========================================================
-    # REFLECTIONS MANAGEMENT
-    # =========================================================
-    def save_reflections(self, filename, reflections, tags=None):
-        """Save reflections with optional tags to the reflections folder."""
-        data = {
-            "tags": tags or [],
-            "questions": reflections
-        }
-        file_path = self.reflections_path / f"{filename}_reflections.json"
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
-    def load_reflections(self, filename):
-        """Load specific reflections from the reflections folder."""
-        file_path = self.reflections_path / f"{filename}_reflections.json"
-        if file_path.exists():
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return None
-
-    def load_all_reflections(self):
-        """Load all reflections from the reflections folder."""
-        reflection_files = self.reflections_path.glob("*_reflections.json")
-        reflections = {}
-        for file in reflection_files:
-            topic = file.stem.replace("_reflections", "")
-            with open(file, "r", encoding="utf-8") as f:
-                reflections[topic] = json.load(f)
-        return reflections
-
-    # =========================================================
-    # REFLECTION TREE MANAGEMENT
-    # =========================================================
-    def save_tree(self, filename, tree):
-        """Save a reflection tree to the trees folder."""
-        file_path = self.trees_path / f"{filename}_tree.json"
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(tree, f, indent=2, ensure_ascii=False)
-
-    def load_tree(self, filename):
-        """Load a specific reflection tree from the trees folder."""
-        file_path = self.trees_path / f"{filename}_tree.json"
-        if file_path.exists():
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return None
-
-    # =========================================================
-    # SMART MEMORY SEARCH (with LEGACY PATCH)
-    # =========================================================
-    def search_summaries_by_tag(self, search_tag):
-        """Search summaries by tag."""
-        matches = {}
-        for file in self.embeddings_path.glob("*_summary.json"):
-            topic = file.stem.replace("_summary", "")
-            with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # --- Legacy patch ---
-                if isinstance(data, list):
-                    data = {"tags": ["legacy"], "points": data}
-                tags = data.get("tags", [])
-                if search_tag in tags:
-                    matches[topic] = data
-        return matches
-
-    def search_reflections_by_tag(self, search_tag):
-        """Search reflections by tag."""
-        matches = {}
-        for file in self.reflections_path.glob("*_reflections.json"):
-            topic = file.stem.replace("_reflections", "")
-            with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # --- Legacy patch ---
-                if isinstance(data, list):
-                    data = {"tags": ["legacy"], "questions": data}
-                tags = data.get("tags", [])
-                if search_tag in tags:
-                    matches[topic] = data
-        return matches
-
-    def search_memories(self, search_tag):
-        """Search summaries and reflections by tag."""
-        summary_matches = self.search_summaries_by_tag(search_tag)
-        reflection_matches = self.search_reflections_by_tag(search_tag)
-        return {
-            "summaries": summary_matches,
-            "reflections": reflection_matches
-        }
+from symbiont_core.config import load_settings, MEMORY_ROOT
+from symbiont_core.storage import open_backend, normalize_record, parse_tag_query, evaluate_tag_query
+from symbiont_core.storage import SUMMARY, REFLECTIONS, TREE
+from symbiont_core.reflector.compact_tree import tree_to_dict
+
+
+class MemoryManager:
+    def __init__(self, backend=None):
+        # --- Initialization ---
+        # Backend comes from settings.json ("MEMORY_BACKEND": "json" | "sqlite",
+        # optional "MEMORY_DB" path); the JSON directory layout is the default.
+        # "TREE_FORMAT": "binary" stores JSON-backend trees as .vtree files.
+        if backend is None:
+            settings = load_settings()
+            backend = open_backend(settings.get("MEMORY_BACKEND", "json"), MEMORY_ROOT,
+                                   settings.get("MEMORY_DB"),
+                                   settings.get("TREE_FORMAT", "json"))
+        self.backend = backend
+        # JSON layout paths, kept for callers that still walk the folders.
+        self.embeddings_path  = getattr(backend, "embeddings_path", None)
+        self.reflections_path = getattr(backend, "reflections_path", None)
+        self.trees_path       = getattr(backend, "trees_path", None)
+
+    def batch(self):
+        """Group several saves into one backend transaction."""
+        return self.backend.batch()
+
+    # =========================================================
+    # SUMMARY MANAGEMENT
+    # =========================================================
+    def save_summary(self, filename, summary, tags=None):
+        """Save a single summary with optional tags."""
+        data = {
+            "tags": tags or [],
+            "points": summary
+        }
+        self.backend.save(SUMMARY, filename, data)
+
+    def load_summary(self, filename):
+        """Load a specific summary."""
+        return self.backend.load(SUMMARY, filename)
+
+    def load_all_summaries(self):
+        """Load all summaries."""
+        return self.backend.load_all(SUMMARY)
+
+    # =========================================================
+    # REFLECTIONS MANAGEMENT
+    # =========================================================
+    def save_reflections(self, filename, reflections, tags=None):
+        """Save reflections with optional tags."""
+        data = {
+            "tags": tags or [],
+            "questions": reflections
+        }
+        self.backend.save(REFLECTIONS, filename, data)
+
+    def load_reflections(self, filename):
+        """Load specific reflections."""
+        return self.backend.load(REFLECTIONS, filename)
+
+    def load_all_reflections(self):
+        """Load all reflections."""
+        return self.backend.load_all(REFLECTIONS)
+
+    # =========================================================
+    # REFLECTION TREE MANAGEMENT
+    # =========================================================
+    def save_tree(self, filename, tree):
+        """Save a reflection tree (dict, or CompactTree stored in compact form)."""
+        self.backend.save(TREE, filename, tree)
+
+    def load_tree(self, filename):
+        """Load a specific reflection tree as a {parent: [children]} dict."""
+        tree_file = self.open_tree_file(filename)
+        if tree_file is not None:
+            with tree_file:
+                return tree_file.to_dict()      # decoded straight from the mmap
+        data = self.backend.load(TREE, filename)
+        return tree_to_dict(data) if data is not None else None
+
+    def tree_view(self, filename):
+        """{parent: [children]} mapping of a tree; a binary one is only read on first access."""
+        viewer = getattr(self.backend, "tree_view", None)
+        view = viewer(filename) if viewer else None
+        return view if view is not None else self.load_tree(filename)
+
+    def open_tree_file(self, filename):
+        """Memory-mapped TreeFile for a tree saved in binary form (None otherwise)."""
+        opener = getattr(self.backend, "open_tree_file", None)
+        return opener(filename) if opener else None
+
+    def load_all_trees(self):
+        """Load all reflection trees as dicts."""
+        return {k: tree_to_dict(v) for k, v in self.backend.load_all(TREE).items()}
+
+    def generation(self):
+        """Write counter of the backend; changes whenever memory is saved or deleted."""
+        return self.backend.generation()
+
+    def fingerprints(self, kind):
+        """{topic: change token} for a kind, without loading any record."""
+        return self.backend.fingerprints(kind)
+
+    def fingerprint(self, kind, topic):
+        """Change token of one topic (one stat or one row, not the whole kind)."""
+        return self.backend.fingerprint(kind, topic)
+
+    def list_topics(self, kind):
+        """List topic names stored for a kind ("summary", "reflections", "tree")."""
+        return self.backend.list_topics(kind)
+
+    def delete_topic(self, filename):
+        """Remove a topic's summary, reflections and tree."""
+        with self.backend.batch():
+            for kind in (SUMMARY, REFLECTIONS, TREE):
+                self.backend.delete(kind, filename)
+
+    # =========================================================
+    # SMART MEMORY SEARCH (legacy patch lives in the backend)
+    # =========================================================
+    def search_summaries_by_tag(self, search_tag):
+        """Search summaries by tag."""
+        return self.backend.search_by_tag(SUMMARY, search_tag)
+
+    def search_reflections_by_tag(self, search_tag):
+        """Search reflections by tag."""
+        return self.backend.search_by_tag(REFLECTIONS, search_tag)
+
+    def search_memories(self, search_tag):
+        """Search summaries and reflections by tag."""
+        summary_matches = self.search_summaries_by_tag(search_tag)
+        reflection_matches = self.search_reflections_by_tag(search_tag)
+        return {
+            "summaries": summary_matches,
+            "reflections": reflection_matches
+        }
+
+    def find_topics(self, query, kind=REFLECTIONS):
+        """
+        Topics of `kind` matching a boolean tag query, e.g.
+        "chess poetry", "chess OR poetry", "science -legacy".
+        """
+        return evaluate_tag_query(parse_tag_query(query),
+                                  lambda tag: self.backend.tag_topics(kind, tag),
+                                  lambda: self.backend.tagged_topics(kind))
+
+    def query_memories(self, query):
+        """Like search_memories, but for a boolean tag query."""
+        results = {}
+        for key, kind in (("summaries", SUMMARY), ("reflections", REFLECTIONS)):
+            matches = {}
+            for topic in sorted(self.find_topics(query, kind)):
+                data = self.backend.load(kind, topic)
+                if data is not None:
+                    matches[topic] = normalize_record(kind, data)
+            results[key] = matches
+        return results
@@ -0,0 +1,170 @@
+import json
+import os
+import pathlib
+import traceback
+
+from symbiont_core.storage import normalize_record, SUMMARY, REFLECTIONS, TREE, TreeFileDict
+from symbiont_core.reflector.compact_tree import tree_to_dict
+from symbiont_core.watcher import ChangeWatcher
+
+
+class BackendSource:
+    """One record kind of a MemoryManager, optionally reduced to its payload list."""
+
+    def __init__(self, mem, kind, field=None, transform=None, loader=None):
+        self.mem = mem
+        self.kind = kind
+        self.field = field
+        self.transform = transform
+        self.loader = loader        # topic -> value, instead of backend.load + transform
+
+    def generation(self):
+        return self.mem.generation()
+
+    def fingerprints(self):
+        return self.mem.fingerprints(self.kind)
+
+    def load(self, topic):
+        if self.loader:
+            return self.loader(topic)
+        data = self.mem.backend.load(self.kind, topic)
+        if data is None:
+            return None
+        if self.transform:
+            return self.transform(data)
+        if not self.field:
+            return data
+        return normalize_record(self.kind, data).get(self.field, [])
+
+    def watch_paths(self):
+        return self.mem.backend.watch_paths()
+
+
+class DirectorySource:
+    """Every `*.json` (or other `suffix`) file in a folder, keyed by file stem."""
+
+    def __init__(self, path, suffix=".json", transform=None):
+        self.path = pathlib.Path(path)
+        self.suffixes = (suffix,) if isinstance(suffix, str) else tuple(suffix)
+        self.transform = transform
+
+    def generation(self):
+        return None
+
+    def fingerprints(self):
+        prints = {}
+        if not self.path.exists():
+            return prints
+        with os.scandir(self.path) as it:
+            for entry in it:
+                for suffix in self.suffixes:
+                    if entry.name.endswith(suffix):
+                        st = entry.stat()
+                        prints[entry.name[:-len(suffix)]] = (st.st_mtime_ns, st.st_size)
+                        break
+        return prints
+
+    def load(self, topic):
+        for suffix in self.suffixes:
+            file_path = self.path / f"{topic}{suffix}"
+            if file_path.exists():
+                break
+        else:
+            return None
+        if suffix == ".vtree":
+            return TreeFileDict(file_path)      # read on first access
+        with open(file_path, encoding="utf-8") as f:
+            data = json.load(f)
+        return self.transform(data) if self.transform else data
+
+    def watch_paths(self):
+        return [self.path]
+
+
+class MemorySnapshot:
+    """
+    In-memory copy of several memory sources that refreshes incrementally.
+
+    `refresh()` first compares each source's generation counter (one small
+    read); only when it moved does it list per-topic fingerprints (file
+    mtime/size, or the SQLite row revision) and reload just the topics
+    whose fingerprint changed. Sources without a generation counter are
+    fingerprinted on every refresh. With `watch=True` a ChangeWatcher
+    short-circuits all of that until something on disk actually changes.
+
+    `data[name]` dicts are updated in place, so callers can keep references.
+    """
+
+    def __init__(self, sources, watch=False, interval=1.0):
+        self.sources = sources
+        self.data = {name: {} for name in sources}
+        self._prints = {name: {} for name in sources}
+        self._generations = {name: object() for name in sources}
+        self._loaded = False
+        self.watcher = None
+        if watch:
+            paths = list(dict.fromkeys(p for src in sources.values() for p in src.watch_paths()))
+            self.watcher = ChangeWatcher(
+                paths, suffixes=(".json", ".vtree", "generation", ".sqlite3", "-wal"),
+                interval=interval).start()
+
+    def mark_dirty(self):
+        """Force the next refresh to look at the sources (e.g. after an in-process save)."""
+        self._generations = {name: object() for name in self.sources}
+        if self.watcher:
+            self.watcher.mark("generation")
+
+    def refresh(self, force=False):
+        """Reload changed topics; returns {source name: set of changed topics}."""
+        changed = {name: set() for name in self.sources}
+        if self.watcher and self._loaded and not force:
+            if not self.watcher.pending():
+                return changed
+            self.watcher.drain()
+        for name, src in self.sources.items():
+            gen = src.generation()
+            if not force and gen is not None and gen == self._generations[name]:
+                continue
+            prints = src.fingerprints()
+            old = self._prints[name]
+            data = self.data[name]
+            for topic, fp in list(prints.items()):
+                if topic in old and old[topic] == fp and fp is not None and not force:
+                    continue
+                try:
+                    value = src.load(topic)
+                except Exception:
+                    traceback.print_exc()
+                    value = None
+                if value is None:
+                    del prints[topic]       # retry on the next scan
+                    continue
+                data[topic] = value
+                changed[name].add(topic)
+            for topic in set(old) - set(prints):
+                data.pop(topic, None)
+                changed[name].add(topic)
+            self._prints[name] = prints
+            self._generations[name] = gen
+        self._loaded = True
+        return changed
+
+    def close(self):
+        if self.watcher:
+            self.watcher.stop()
+
+
+def memory_sources(mem, trees_dir=None):
+    """
+    Summaries and reflections (as point/question lists) plus trees (as
+    {parent: [children]} mappings; binary trees are decoded on first access).
+    """
+    sources = {
+        "summaries":   BackendSource(mem, SUMMARY, "points"),
+        "reflections": BackendSource(mem, REFLECTIONS, "questions"),
+    }
+    if trees_dir:
+        sources["trees"] = DirectorySource(trees_dir, (".vtree", ".json"), transform=tree_to_dict)
+    else:
+        sources["trees"] = BackendSource(mem, TREE, loader=mem.tree_view)
+    return sources
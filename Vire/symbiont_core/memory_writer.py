@@ -0,0 +1,139 @@
+"""
+Write-behind writer for learned chat memories.
+
+`submit(text)` returns the memory's name at once and queues the save; a
+daemon thread reflects on the queued texts, grows their trees and stores
+everything it finds waiting as one group commit (`MemoryManager.batch()`:
+one generation bump for JSON, one transaction for SQLite). The manager,
+reflector and tree builder are created once and reused for every save.
+
+Names are `chat` + a microsecond timestamp that never repeats or goes
+backwards within the process, so saves in the same second do not
+overwrite each other and still sort in the order they were made.
+With `flush_at_exit` the queue is written out before the interpreter exits.
+"""
+import atexit
+import datetime
+import queue
+import threading
+import traceback
+
+_STOP = object()
+
+
+class MemoryWriter:
+    def __init__(self, mem, reflector, builder, layers=2, max_batch=64, on_commit=None,
+                 flush_at_exit=True):
+        self.mem        = mem
+        self.reflector  = reflector
+        self.builder    = builder
+        self.layers     = layers
+        self.max_batch  = max_batch
+        self.on_commit  = on_commit     # called with the names of each committed group (writer thread)
+        self.committed  = 0
+        self.batches    = 0
+        self.failed     = 0
+        self._queue     = queue.Queue()
+        self._pending   = 0
+        self._done      = threading.Condition()
+        self._name_lock = threading.Lock()
+        self._last      = None
+        self._closed    = False
+        self._thread    = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+        self._thread.start()
+        if flush_at_exit:
+            atexit.register(self.close)
+
+    # =========================================================
+    # NAMES
+    # =========================================================
+    def new_name(self, prefix="chat"):
+        """A fresh, increasing name: prefix + YYYYmmddHHMMSS + microseconds."""
+        with self._name_lock:
+            now = datetime.datetime.now()
+            if self._last is not None and now <= self._last:
+                now = self._last + datetime.timedelta(microseconds=1)
+            self._last = now
+        return f"{prefix}{now:%Y%m%d%H%M%S%f}"
+
+    # =========================================================
+    # QUEUE
+    # =========================================================
+    def submit(self, text, tags=("chat",)):
+        """Queue `text` to be learned; returns the name it will be stored under."""
+        if self._closed:
+            raise RuntimeError("memory writer is closed")
+        name = self.new_name()
+        with self._done:
+            self._pending += 1
+        self._queue.put((name, text, list(tags)))
+        return name
+
+    @property
+    def pending(self):
+        with self._done:
+            return self._pending
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far is stored; False if `timeout` ran out first."""
+        with self._done:
+            return self._done.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout=None):
+        """Store what is queued, then stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    # =========================================================
+    # WRITER THREAD
+    # =========================================================
+    def _run(self):
+        stop = False
+        while not stop:
+            group = [self._queue.get()]
+            # group commit: take whatever else queued up meanwhile
+            while len(group) < self.max_batch:
+                try:
+                    group.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in group:
+                stop = True
+                group = [item for item in group if item is not _STOP]
+            if group:
+                self._commit(group)
+
+    def _commit(self, group):
+        names = []
+        try:
+            records = []
+            for name, text, tags in group:
+                summary = [text]
+                reflections = self.reflector.reflect_on_summary(summary)
+                tree = self.builder.grow_compact(reflections, layers=self.layers)
+                records.append((name, summary, reflections, tree, tags))
+            with self.mem.batch():
+                for name, summary, reflections, tree, tags in records:
+                    self.mem.save_summary(name, summary, tags=tags)
+                    self.mem.save_reflections(name, reflections, tags=tags)
+                    self.mem.save_tree(name, tree)
+            names = [record[0] for record in records]
+            self.committed += len(names)
+            self.batches += 1
+        except Exception:
+            self.failed += len(group)
+            print(f"⚠️  Could not store {len(group)} chat memories: "
+                  f"{', '.join(item[0] for item in group)}")
+            traceback.print_exc()
+        if names and self.on_commit:
+            try:
+                self.on_commit(names)
+            except Exception:
+                traceback.print_exc()
+        with self._done:
+            self._pending -= len(group)
+            self._done.notify_all()
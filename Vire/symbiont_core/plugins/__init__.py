@@ -1,13 +1,91 @@
-﻿import importlib
-from pathlib import Path
-
-def load_all(register_command):
-    """
-    Auto-load every *.plugin.py in this folder and
-    call its register(register_command) if present.
-    """
-    plug_dir = Path(__file__).parent
-    for f in plug_dir.glob("*.plugin.py"):
-        mod = importlib.import_module(f"symbiont_core.plugins.{f.stem}")
-        if hasattr(mod, "register"):
-            mod.register(register_command)
+﻿"""
+Plugin loading.
+
+A plugin is a *.plugin.py file with a register(register_command[, http])
+function. Plugins can declare their commands in a header before any code:
+
+    # @command wiki w define
+
+(command name, then aliases). Those are registered as stubs and the
+plugin is imported on first use, so `chess`, the HTTP client and the
+like are not loaded until a command needs them. Plugins without a
+header are imported straight away. live_chat's load_plugin() walks this
+folder (and reloads edited files) with the helpers below.
+"""
+import importlib.util
+import threading
+from pathlib import Path
+
+def register_plugin(mod, register_command, http=None):
+    """
+    Call a plugin module's register(). Plugins whose register() accepts
+    an `http` argument get the shared HttpClient.
+    """
+    import inspect
+    register = getattr(mod, "register", None)
+    if register is None:
+        return
+    if "http" in inspect.signature(register).parameters:
+        if http is None:
+            from symbiont_core.http_client import get_client
+            http = get_client()
+        register(register_command, http=http)
+    else:
+        register(register_command)
+
+def read_manifest(path):
+    """[(command, [aliases])] from a plugin's `# @command` header; [] if it has none."""
+    commands = []
+    with open(path, encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                break
+            if line.startswith("# @command"):
+                name, *aliases = line[len("# @command"):].split()
+                commands.append((name, aliases))
+    return commands
+
+def load_plugin_file(path, register_command, http=None):
+    """Import one *.plugin.py and register its commands; returns the module."""
+    spec = importlib.util.spec_from_file_location(Path(path).stem, str(path))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    register_plugin(mod, register_command, http)
+    return mod
+
+class LazyPlugin:
+    """
+    Stub commands for a plugin that has not been imported yet. The first
+    call imports it; its register() replaces the stubs with the real
+    commands and the call is passed on.
+    """
+
+    def __init__(self, path, register_command, http=None):
+        self.path             = Path(path)
+        self.register_command = register_command
+        self.http             = http
+        self.module           = None
+        self.commands         = {}
+        self._lock            = threading.Lock()
+
+    def stub(self, name):
+        def command(args):
+            return self.load(name)(args)
+        command.__name__ = f"{name}_stub"
+        command.__doc__ = f"{name} (loaded from {self.path.name} on first use)"
+        return command
+
+    def load(self, name=None):
+        """Import the plugin (once) and return the real function for `name`."""
+        with self._lock:
+            if self.module is None:
+                def collect(cmd, func, aliases=[]):
+                    self.commands[cmd] = func
+                    self.register_command(cmd, func, aliases=aliases)
+                self.module = load_plugin_file(self.path, collect, self.http)
+        if name is None:
+            return None
+        if name not in self.commands:
+            raise RuntimeError(f"{self.path.name} declares '{name}' but does not register it")
+        return self.commands[name]
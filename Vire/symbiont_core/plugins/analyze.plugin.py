@@ -0,0 +1,57 @@
+# symbiont_core/plugins/analyze.plugin.py
+# @command analyze analyse batch
+
+import pathlib
+
+from symbiont_core.batch_analysis import iter_positions, analyse_batch, BatchReport
+from symbiont_core.config import MEMORY_ROOT
+from symbiont_core.engine_pool import get_pool
+from symbiont_core.eval_cache import get_eval_cache
+
+def analyze_cmd(args):
+    """
+    Analyse every position of a PGN file or FEN list on the Stockfish pool.
+    Usage: analyze [file.pgn|fens.txt] [depth] [out.jsonl]
+    Results stream in as engines finish and are appended to out.jsonl
+    (default: memory/analysis/<file>.jsonl). Transpositions are analysed once
+    and positions already in the evaluation cache are not analysed again.
+    """
+    if not args:
+        print("Usage: analyze [file.pgn|fens.txt] [depth] [out.jsonl]")
+        return
+
+    src = pathlib.Path(args[0]).expanduser()
+    if not src.exists():
+        print(f"⚠️  File not found: {src}")
+        return
+    depth = int(args[1]) if len(args) > 1 and args[1].isdigit() else 12
+    out = pathlib.Path(args[2]) if len(args) > 2 else MEMORY_ROOT / "analysis" / f"{src.stem}.jsonl"
+
+    pool = get_pool()
+    report = BatchReport()
+    print(f"\n♟️  Analysing {src.name} at depth {depth} on {pool.size} engine(s)…")
+    try:
+        for result in analyse_batch(pool, iter_positions(src), depth=depth,
+                                    out_path=out, report=report, cache=get_eval_cache()):
+            done = report.analysed + report.failed
+            if "error" in result:
+                print(f"  [{done}] ⚠️  {result['error']}  {result['fen']}")
+                continue
+            line = result["lines"][0] if result["lines"] else {}
+            score = f"#{line['mate']}" if line.get("mate") is not None else \
+                    f"{line['cp'] / 100:+.2f}" if line.get("cp") is not None else "?"
+            mark = " (cached)" if result.get("cached") else ""
+            print(f"  [{done}] {result['best'] or '-':<6} {score:>7}  {result['fen']}{mark}")
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopped.")
+    except Exception as e:
+        print(f"⚠️  Batch analysis failed: {e}")
+        return
+
+    dupes = report.positions - report.unique
+    print(f"\n📊 {report.analysed} positions in {report.seconds:.2f}s ({report.rate:.1f} positions/s); "
+          f"{dupes} transposition(s) skipped, {report.cached} cached, {report.failed} failed")
+    print(f"   Results: {out}\n")
+
+def register(register_command):
+    register_command("analyze", analyze_cmd, aliases=["analyse", "batch"])
@@ -1,57 +1,71 @@
-# symbiont_core/plugins/lichess_eval.plugin.py
-
-import urllib.parse
-import urllib.request
-import json
-
-def lichess_cmd(args):
-    """
-    Get a best‐move and evaluation from Lichess Cloud Analysis.
-    Usage: lichess [FEN] [multiPv] [depth]
-    Examples:
-      lichess                            → starting position, 1 top move, depth=15
-      lichess <FEN> 3 20                → custom FEN, 3 candidate moves, depth=20
-    """
-    # defaults
-    fen     = args[0] if args else "startpos"
-    multipv = int(args[1]) if len(args)>1 and args[1].isdigit() else 1
-    depth   = int(args[2]) if len(args)>2 and args[2].isdigit() else 15
-
-    # for starting position, Lichess wants the FEN string:
-    if fen.lower() == "startpos":
-        fen = "rn1qkbnr/ppp1pppp/8/3p4/3P4/5N2/PPP1PPPP/RNBQKB1R w KQkq - 0 1"  # or use standard start FEN
-
-    # build URL
-    params = {
-        "fen":     fen,
-        "multiPv": multipv,
-        "depth":   depth
-    }
-    url = "https://lichess.org/api/cloud-eval?" + urllib.parse.urlencode(params)
-
-    req = urllib.request.Request(url, headers={"Accept": "application/json"})
-    try:
-        with urllib.request.urlopen(req) as resp:
-            data = json.load(resp)
-    except Exception as e:
-        print(f"⚠️  Cloud analysis failed: {e}")
-        return
-
-    if "error" in data:
-        print(f"⚠️  API error: {data['error']}")
-        return
-
-    # data["pvs"] is a list of PV objects
-    print(f"\n☁️  Lichess Cloud Eval (depth={depth}, multiPv={multipv}):")
-    for pv in data.get("pvs", []):
-        move   = pv.get("moves", "").split()[0]
-        score  = pv.get("cp")  # centipawn
-        mate   = pv.get("mate")  # mate in N
-        sd     = pv.get("sd")  # search depth reported
-        evalstr = f"{score/100:.2f}" if score is not None else f"mate in {mate}"
-        print(f" • Move: {move}    Eval: {evalstr}    Depth reported: {sd}")
-    print()
-
-def register(register_command):
-    register_command("lichess", lichess_cmd,
-                     aliases=["cloud","eval"])
+# symbiont_core/plugins/lichess_eval.plugin.py
+# @command lichess cloud eval
+
+import urllib.parse
+from symbiont_core.eval_cache import get_eval_cache
+
+HTTP = None
+
+def lichess_cmd(args):
+    """
+    Get a best‐move and evaluation from Lichess Cloud Analysis.
+    Usage: lichess [FEN] [multiPv] [depth]
+    Examples:
+      lichess                            → starting position, 1 top move, depth=15
+      lichess <FEN> 3 20                → custom FEN, 3 candidate moves, depth=20
+    """
+    # defaults
+    fen     = args[0] if args else "startpos"
+    multipv = int(args[1]) if len(args)>1 and args[1].isdigit() else 1
+    depth   = int(args[2]) if len(args)>2 and args[2].isdigit() else 15
+
+    # for starting position, Lichess wants the FEN string:
+    if fen.lower() == "startpos":
+        fen = "rn1qkbnr/ppp1pppp/8/3p4/3P4/5N2/PPP1PPPP/RNBQKB1R w KQkq - 0 1"  # or use standard start FEN
+
+    # a cached evaluation at least this deep skips the request
+    cache = get_eval_cache()
+    lines = cache.get(fen, depth, multipv, source="lichess") if cache is not None else None
+    cached = lines is not None
+
+    if not cached:
+        # build URL
+        params = {
+            "fen":     fen,
+            "multiPv": multipv,
+            "depth":   depth
+        }
+        url = "https://lichess.org/api/cloud-eval?" + urllib.parse.urlencode(params)
+
+        try:
+            data = HTTP.get(url, headers={"Accept": "application/json"}).json()
+        except Exception as e:
+            print(f"⚠️  Cloud analysis failed: {e}")
+            return
+
+        if "error" in data:
+            print(f"⚠️  API error: {data['error']}")
+            return
+
+        # data["pvs"] is a list of PV objects; the search depth is reported once for all of them
+        reported = data.get("depth")
+        lines = [{"cp": pv.get("cp"), "mate": pv.get("mate"),
+                  "pv": pv.get("moves", "").split(), "depth": reported}
+                 for pv in data.get("pvs", [])]
+        if cache is not None and lines and reported is not None:
+            cache.put(fen, reported, len(lines), lines, source="lichess")
+
+    print(f"\n☁️  Lichess Cloud Eval (depth={depth}, multiPv={multipv})" + (" [cached]:" if cached else ":"))
+    for line in lines:
+        move   = line["pv"][0] if line["pv"] else "-"
+        score  = line["cp"]    # centipawn
+        mate   = line["mate"]  # mate in N
+        evalstr = f"{score/100:.2f}" if score is not None else f"mate in {mate}"
+        print(f" • Move: {move}    Eval: {evalstr}    Depth reported: {line['depth']}")
+    print()
+
+def register(register_command, http):
+    global HTTP
+    HTTP = http
+    register_command("lichess", lichess_cmd,
+                     aliases=["cloud","eval"])
@@ -1,2 +1,4 @@
-from .basic_reflector import Reflector
-from .reflection_tree_builder import ReflectionTreeBuilder
+from .basic_reflector import Reflector
+from .reflection_tree_builder import ReflectionTreeBuilder
+from .compact_tree import CompactTree
+from .lazy_tree import LazyTree
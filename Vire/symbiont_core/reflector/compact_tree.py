@@ -0,0 +1,301 @@
+from array import array
+from collections import deque
+
+from symbiont_core.storage.base import COMPACT_TREE_FORMAT, is_compact_tree
+
+# Child templates used by ReflectionTreeBuilder. A node built from a
+# template stores only (parent id, template id); its text is rendered
+# from the parent's text when asked for.
+CHILD_TEMPLATES = (
+    'Why is "{}" significant?',
+    'What could challenge "{}"?',
+)
+
+LITERAL = -1    # template id of nodes whose text lives in the string table
+
+
+class CompactTree:
+    """
+    Reflection tree as parallel integer arrays.
+
+      parent[i]      parent node id (-1 for roots)
+      template[i]    template id, or LITERAL for nodes with their own text
+      ref[i]         string-table index of a LITERAL node's text (else -1)
+      first_child[i] id of the first child; children are contiguous
+      n_children[i]  number of children
+
+    Only roots (and text that doesn't match a template) go into the
+    interned string table, so memory and disk use follow the node count
+    instead of node count × depth × text length.
+    """
+
+    def __init__(self, templates=CHILD_TEMPLATES):
+        self.templates   = list(templates)
+        self.strings     = []
+        self._interned   = {}
+        self.parent      = array("i")
+        self.template    = array("b")
+        self.ref         = array("i")
+        self.first_child = array("i")
+        self.n_children  = array("I")
+        self.leaf_keys   = set()    # expanded nodes that have no children
+
+    def __len__(self):
+        return len(self.parent)
+
+    # =========================================================
+    # BUILDING
+    # =========================================================
+    def _intern(self, text):
+        idx = self._interned.get(text)
+        if idx is None:
+            idx = self._interned[text] = len(self.strings)
+            self.strings.append(text)
+        return idx
+
+    def _append(self, parent, template, ref):
+        self.parent.append(parent)
+        self.template.append(template)
+        self.ref.append(ref)
+        self.first_child.append(-1)
+        self.n_children.append(0)
+        return len(self.parent) - 1
+
+    def add_root(self, text):
+        return self._append(-1, LITERAL, self._intern(text))
+
+    def add_children(self, node, items):
+        """
+        Append the children of `node` in one contiguous run. Each item is
+        a template id (int) or a literal text (str). Returns the new ids.
+        """
+        if self.n_children[node]:
+            raise ValueError(f"node {node} already has children")
+        start = len(self.parent)
+        for item in items:
+            if isinstance(item, int):
+                self._append(node, item, -1)
+            else:
+                self._append(node, LITERAL, self._intern(item))
+        count = len(self.parent) - start
+        if count:
+            self.first_child[node] = start
+            self.n_children[node] = count
+        else:
+            self.leaf_keys.add(node)
+        return range(start, start + count)
+
+    # =========================================================
+    # READING
+    # =========================================================
+    def roots(self):
+        return [i for i, p in enumerate(self.parent) if p == -1]
+
+    def children(self, node):
+        start = self.first_child[node]
+        return range(start, start + self.n_children[node]) if start >= 0 else range(0)
+
+    def is_expanded(self, node):
+        return self.n_children[node] > 0 or node in self.leaf_keys
+
+    def depth(self, node):
+        d = 0
+        while self.parent[node] != -1:
+            node = self.parent[node]
+            d += 1
+        return d
+
+    def text(self, node):
+        """Render a node's full text (walks up to the nearest literal)."""
+        chain = []
+        while self.template[node] != LITERAL:
+            chain.append(self.template[node])
+            node = self.parent[node]
+        text = self.strings[self.ref[node]]
+        for tid in reversed(chain):
+            text = self.templates[tid].format(text)
+        return text
+
+    def iter_bfs(self):
+        queue = deque(self.roots())
+        while queue:
+            node = queue.popleft()
+            yield node
+            queue.extend(self.children(node))
+
+    def to_dict(self):
+        """Expand to the classic {parent: [children]} dict (renders every node)."""
+        tree = {}
+        for node in self.iter_bfs():
+            if self.is_expanded(node):
+                tree[self.text(node)] = [self.text(c) for c in self.children(node)]
+        return tree
+
+    # =========================================================
+    # (DE)SERIALIZATION
+    # =========================================================
+    def to_document(self):
+        """JSON-ready document; children are implied by contiguous parent ids."""
+        return {
+            "format":    COMPACT_TREE_FORMAT,
+            "templates": self.templates,
+            "strings":   self.strings,
+            "parent":    self.parent.tolist(),
+            "template":  self.template.tolist(),
+            "ref":       self.ref.tolist(),
+            "leaf_keys": sorted(self.leaf_keys),
+        }
+
+    @classmethod
+    def from_document(cls, doc):
+        tree = cls(doc["templates"])
+        tree.strings = list(doc["strings"])
+        tree._interned = {s: i for i, s in enumerate(tree.strings)}
+        tree.parent.extend(doc["parent"])
+        tree.template.extend(doc["template"])
+        tree.ref.extend(doc["ref"])
+        n = len(tree.parent)
+        tree.first_child.extend([-1] * n)
+        tree.n_children.extend([0] * n)
+        for node, parent in enumerate(tree.parent):
+            if parent != -1:
+                if tree.first_child[parent] == -1:
+                    tree.first_child[parent] = node
+                tree.n_children[parent] += 1
+        tree.leaf_keys = set(doc.get("leaf_keys", []))
+        return tree
+
+    @classmethod
+    def from_dict(cls, tree_dict, templates=CHILD_TEMPLATES):
+        """
+        Compact a classic dict tree. Children whose text is a template
+        applied to their parent become template nodes; each key is
+        expanded once, so shared or cyclic entries stay finite.
+        """
+        return fill_from_dict(cls(templates), tree_dict)
+
+    @classmethod
+    def merge(cls, trees):
+        """
+        Join trees built breadth-first (as grow_compact builds them) into
+        one, in the node order a single breadth-first build over all their
+        roots gives. Layers are copied slice by slice, so subtrees grown
+        elsewhere come back without re-adding node by node.
+        """
+        trees = list(trees)
+        merged = cls(trees[0].templates if trees else CHILD_TEMPLATES)
+        layers = [tree._layers() for tree in trees]
+        placed = [[] for _ in trees]    # per tree: merged start of each layer
+        for depth in range(max(map(len, layers), default=0)):
+            for i, tree in enumerate(trees):
+                if depth >= len(layers[i]):
+                    continue
+                lo, hi = layers[i][depth]
+                placed[i].append(len(merged.parent))
+                parent = tree.parent[lo:hi]
+                if depth:
+                    delta = placed[i][depth - 1] - layers[i][depth - 1][0]
+                    parent = array("i", map(delta.__add__, parent))
+                ref = tree.ref[lo:hi]
+                if ref.count(-1) != len(ref):
+                    strings = tree.strings
+                    ref = array("i", (r if r < 0 else merged._intern(strings[r]) for r in ref))
+                merged.parent.extend(parent)
+                merged.template.extend(tree.template[lo:hi])
+                merged.ref.extend(ref)
+                merged.n_children.extend(tree.n_children[lo:hi])
+        # children ids point into the next layer, known only now
+        for depth in range(max(map(len, layers), default=0)):
+            for i, tree in enumerate(trees):
+                if depth >= len(layers[i]):
+                    continue
+                lo, hi = layers[i][depth]
+                first = tree.first_child[lo:hi]
+                leaves = first.count(-1)
+                if leaves != len(first):
+                    delta = placed[i][depth + 1] - layers[i][depth + 1][0]
+                    first = array("i", map(delta.__add__, first) if not leaves else
+                                  (f + delta if f >= 0 else -1 for f in first))
+                merged.first_child.extend(first)
+        for i, tree in enumerate(trees):
+            for node in tree.leaf_keys:
+                d = next(d for d, (lo, hi) in enumerate(layers[i]) if lo <= node < hi)
+                merged.leaf_keys.add(placed[i][d] + node - layers[i][d][0])
+        return merged
+
+    def _layers(self):
+        """[(start, end)] of each depth; nodes must be in breadth-first order."""
+        spans, start, end = [], 0, 0
+        while end < len(self.parent) and self.parent[end] == -1:
+            end += 1
+        while start < end:
+            spans.append((start, end))
+            start, end = end, end + sum(self.n_children[start:end])
+        if start != len(self.parent):
+            raise ValueError("tree is not in breadth-first order")
+        return spans
+
+
+def fill_from_dict(tree, tree_dict):
+    """
+    Add a classic dict tree to `tree` breadth-first: a CompactTree, or a
+    TreeWriter to stream it to disk without building the arrays.
+    """
+    children_of_any = {c for kids in tree_dict.values() for c in kids}
+    roots = [k for k in tree_dict if k not in children_of_any] or list(tree_dict)[:1]
+    rendered = {}
+    queue = deque()
+    for text in roots:
+        node = tree.add_root(text)
+        rendered[node] = text
+        queue.append(node)
+    expanded = set()
+    while queue:
+        node = queue.popleft()
+        text = rendered.pop(node)
+        if text not in tree_dict or text in expanded:
+            continue
+        expanded.add(text)
+        items = []
+        for child in tree_dict[text]:
+            for tid, tpl in enumerate(tree.templates):
+                if tpl.format(text) == child:
+                    items.append(tid)
+                    break
+            else:
+                items.append(child)
+        for child_node, child in zip(tree.add_children(node, items), tree_dict[text]):
+            rendered[child_node] = child
+            queue.append(child_node)
+    return tree
+
+
+
+def fill_from_document(tree, doc):
+    """
+    Add a compact tree document to `tree` (a CompactTree or TreeWriter).
+    Children of a node are contiguous and in breadth-first order, so they
+    are replayed run by run straight from the arrays.
+    """
+    parent, template, ref, strings = doc["parent"], doc["template"], doc["ref"], doc["strings"]
+    leaf_keys = set(doc.get("leaf_keys", []))
+    n = len(parent)
+    child = 0
+    while child < n and parent[child] == -1:
+        tree.add_root(strings[ref[child]])
+        child += 1
+    for node in range(n):
+        end = child
+        while end < n and parent[end] == node:
+            end += 1
+        if end > child or node in leaf_keys:
+            tree.add_children(node, [template[c] if template[c] != LITERAL else strings[ref[c]]
+                                     for c in range(child, end)])
+        child = end
+    return tree
+
+def tree_to_dict(data):
+    """Stored tree (classic dict or compact document) → {parent: [children]}."""
+    if is_compact_tree(data):
+        return CompactTree.from_document(data).to_dict()
+    return data
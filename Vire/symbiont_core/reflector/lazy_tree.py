@@ -0,0 +1,101 @@
+from collections import deque
+
+from .compact_tree import CHILD_TEMPLATES
+
+
+class LazyNode:
+    """A node whose text and children are produced only when asked for."""
+
+    __slots__ = ("tree", "parent", "template", "depth", "_text")
+
+    def __init__(self, tree, parent, template, depth, text=None):
+        self.tree     = tree
+        self.parent   = parent
+        self.template = template
+        self.depth    = depth
+        self._text    = text
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self.tree.templates[self.template].format(self.parent.text)
+        return self._text
+
+    def has_children(self):
+        return self.tree.layers is None or self.depth < self.tree.layers
+
+    def children(self):
+        """Generate this node's children (nothing is stored on the node)."""
+        if not self.has_children():
+            return
+        for tid in range(len(self.tree.templates)):
+            yield LazyNode(self.tree, self, tid, self.depth + 1)
+
+
+class LazyTree:
+    """
+    Reflection tree that expands a node's children only when visited.
+
+    Same shape as ReflectionTreeBuilder.grow_tree(reflections, layers):
+    nodes at depth < layers get one child per template. `layers=None`
+    means unbounded, so the iterators' budgets are what stop the walk.
+
+    Both iterators stop after `max_nodes` nodes or `max_bytes` bytes of
+    rendered text and then set `truncated`; depth-first keeps only the
+    current path (plus pending sibling generators) in memory, so
+    `tree <tag> 30` prints its first lines without building 2^30 nodes.
+    """
+
+    def __init__(self, reflections, layers=2, templates=CHILD_TEMPLATES):
+        self.reflections = list(reflections)
+        self.layers      = layers
+        self.templates   = list(templates)
+        self.truncated   = False
+
+    def roots(self):
+        return [LazyNode(self, None, None, 0, text) for text in self.reflections]
+
+    def _budget(self, max_nodes, max_bytes):
+        count, size = 0, 0
+        def spend(node):
+            nonlocal count, size
+            count += 1
+            if max_bytes is not None:
+                size += len(node.text.encode("utf-8"))
+            return ((max_nodes is None or count <= max_nodes) and
+                    (max_bytes is None or size <= max_bytes))
+        return spend
+
+    def iter_dfs(self, max_nodes=None, max_bytes=None):
+        """Pre-order depth-first walk (the order `tree` prints in)."""
+        self.truncated = False
+        spend = self._budget(max_nodes, max_bytes)
+        stack = [iter(self.roots())]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                continue
+            if not spend(node):
+                self.truncated = True
+                return
+            yield node
+            if node.has_children():
+                stack.append(node.children())
+
+    def iter_bfs(self, max_nodes=None, max_bytes=None):
+        """Level-order walk; the queue only ever holds nodes within the budget."""
+        self.truncated = False
+        spend = self._budget(max_nodes, max_bytes)
+        queue = deque(self.roots())
+        while queue:
+            node = queue.popleft()
+            if not spend(node):
+                self.truncated = True
+                return
+            yield node
+            queue.extend(node.children())
+            if max_nodes is not None and len(queue) > max_nodes:
+                # nodes past the budget can never be yielded; don't hold them
+                while len(queue) > max_nodes:
+                    queue.pop()
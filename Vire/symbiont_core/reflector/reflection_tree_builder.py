@@ -1,27 +1,48 @@
-﻿import pathlib
-import json
-
-class ReflectionTreeBuilder:
-    def __init__(self):
-        self.trees_path = pathlib.Path(__file__).resolve().parents[2] / 'memory' / 'trees'
-        self.trees_path.mkdir(parents=True, exist_ok=True)
-
-    def grow_tree(self, reflections, layers=2):
-        tree = {}
-        current_layer = reflections
-        for depth in range(layers):
-            next_layer = []
-            for reflection in current_layer:
-                sub_questions = [
-                    f'Why is \"{reflection}\" significant?',
-                    f'What could challenge \"{reflection}\"?'
-                ]
-                tree[reflection] = sub_questions
-                next_layer.extend(sub_questions)
-            current_layer = next_layer
-        return tree
-
-    def save_tree(self, filename, tree):
-        file_path = self.trees_path / f"{filename}_tree.json"
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(tree, f, indent=2)
+﻿import pathlib
+import json
+
+from .compact_tree import CompactTree, CHILD_TEMPLATES
+from .lazy_tree import LazyTree
+
+class ReflectionTreeBuilder:
+    def __init__(self):
+        self.trees_path = pathlib.Path(__file__).resolve().parents[2] / 'memory' / 'trees'
+        self.trees_path.mkdir(parents=True, exist_ok=True)
+
+    def grow_tree(self, reflections, layers=2):
+        tree = {}
+        current_layer = reflections
+        for depth in range(layers):
+            next_layer = []
+            for reflection in current_layer:
+                sub_questions = [
+                    f'Why is \"{reflection}\" significant?',
+                    f'What could challenge \"{reflection}\"?'
+                ]
+                tree[reflection] = sub_questions
+                next_layer.extend(sub_questions)
+            current_layer = next_layer
+        return tree
+
+    def grow_compact(self, reflections, layers=2):
+        """Same tree as grow_tree, as a CompactTree (node text rendered on demand)."""
+        tree = CompactTree(CHILD_TEMPLATES)
+        current_layer = [tree.add_root(r) for r in reflections]
+        for depth in range(layers):
+            next_layer = []
+            for node in current_layer:
+                next_layer.extend(tree.add_children(node, range(len(CHILD_TEMPLATES))))
+            current_layer = next_layer
+        return tree
+
+    def lazy_tree(self, reflections, layers=2):
+        """Same tree as grow_tree, expanded only as it is walked (layers=None: unbounded)."""
+        return LazyTree(reflections, layers, CHILD_TEMPLATES)
+
+    def save_tree(self, filename, tree):
+        file_path = self.trees_path / f"{filename}_tree.json"
+        with open(file_path, 'w', encoding='utf-8') as f:
+            if isinstance(tree, CompactTree):
+                json.dump(tree.to_document(), f, separators=(",", ":"))
+            else:
+                json.dump(tree, f, indent=2)
@@ -0,0 +1,161 @@
+"""
+TTL cache for plugin HTTP responses.
+
+Keys are sha256 digests of method + URL + body, so URLs carrying API
+keys are never written anywhere. An entry is
+
+  fresh   age < ttl                    served without touching the network
+  stale   age < ttl + stale_window     served at once, refreshed in the background
+  expired otherwise                    refetched; if that fails the old copy is
+                                       still served (stale-if-error)
+
+Entries live in an in-process LRU and, optionally, in a size-bounded
+DiskCache so lookups survive restarts and work offline.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from symbiont_core.disk_cache import DiskCache
+
+
+class CachedResponse:
+    __slots__ = ("status", "headers", "body", "stored")
+
+    def __init__(self, status, headers, body, stored):
+        self.status  = status
+        self.headers = headers
+        self.body    = body
+        self.stored  = stored
+
+    def to_bytes(self):
+        head = json.dumps({"status": self.status, "headers": self.headers,
+                           "stored": self.stored}, separators=(",", ":"))
+        return head.encode("utf-8") + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, data):
+        head, _, body = data.partition(b"\n")
+        meta = json.loads(head.decode("utf-8"))
+        return cls(meta["status"], meta["headers"], body, meta["stored"])
+
+
+class ResponseCache:
+    def __init__(self, max_entries=256, disk_dir=None, max_bytes=0, clock=time.time):
+        self.max_entries = max_entries
+        self.disk        = DiskCache(disk_dir, max_bytes) if disk_dir and max_bytes else None
+        self.clock       = clock
+        self._lru        = OrderedDict()
+        self._lock       = threading.Lock()
+        self._refreshing = set()
+        self.counters    = {"hits": 0, "stale_hits": 0, "misses": 0,
+                            "revalidations": 0, "stale_if_error": 0}
+
+    @staticmethod
+    def key(method, url, body=None):
+        h = hashlib.sha256(f"{method} {url}".encode("utf-8"))
+        if body:
+            h.update(b"\n" + body)
+        return h.hexdigest()
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    # =========================================================
+    # STORAGE TIERS
+    # =========================================================
+    def lookup(self, key):
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+                return entry
+        data = self.disk.get(key) if self.disk is not None else None
+        if data is None:
+            return None
+        try:
+            entry = CachedResponse.from_bytes(data)
+        except (ValueError, KeyError):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def store(self, key, status, headers, body):
+        entry = CachedResponse(status, headers, body, self.clock())
+        self._remember(key, entry)
+        if self.disk is not None:
+            self.disk.put(key, entry.to_bytes())
+        return entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    # =========================================================
+    # POLICY
+    # =========================================================
+    def fetch(self, key, ttl, stale_window, fetch, cacheable=lambda status: status == 200):
+        """
+        Return (entry, state) where state is "hit", "stale", "miss" or
+        "error" (expired copy served because `fetch` raised). `fetch()`
+        returns (status, headers, body); only `cacheable` statuses are kept.
+        """
+        entry = self.lookup(key)
+        age = self.clock() - entry.stored if entry else None
+        if entry and age < ttl:
+            self._count("hits")
+            return entry, "hit"
+        if entry and age < ttl + stale_window:
+            self._count("stale_hits")
+            self._revalidate(key, fetch, cacheable)
+            return entry, "stale"
+        self._count("misses")
+        try:
+            status, headers, body = fetch()
+        except Exception:
+            if entry is None:
+                raise
+            self._count("stale_if_error")
+            return entry, "error"
+        if cacheable(status):
+            return self.store(key, status, headers, body), "miss"
+        return CachedResponse(status, headers, body, self.clock()), "miss"
+
+    def _revalidate(self, key, fetch, cacheable):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                status, headers, body = fetch()
+                if cacheable(status):
+                    self.store(key, status, headers, body)
+                self._count("revalidations")
+            except Exception:
+                pass            # keep serving the stale copy
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name="http-revalidate", daemon=True).start()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats["entries"] = len(self._lru)
+        stats["disk_entries"] = len(self.disk) if self.disk is not None else 0
+        return stats
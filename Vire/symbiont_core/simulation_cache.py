@@ -0,0 +1,81 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from symbiont_core.disk_cache import DiskCache
+
+
+class SimulationCache:
+    """
+    Two-tier cache of simulation results.
+
+    Keys are JSON-able tuples that include the memory version the result
+    was computed from (see SimulationEngine._version), so a change to the
+    tagged reflections simply produces a new key; stale entries age out.
+
+      memory  LRU of up to `max_entries` results
+      disk    optional DiskCache of JSON files (one per key hash), trimmed
+              to `max_bytes` by evicting the least recently used file
+
+    Both tiers hold encoded JSON and every `get` decodes a fresh copy, so
+    a caller that mutates a result cannot change the cached one. The
+    cache is safe to share between threads (live chat's jobs).
+    """
+
+    def __init__(self, max_entries=128, disk_dir=None, max_bytes=0):
+        self.max_entries = max_entries
+        self.disk        = DiskCache(disk_dir, max_bytes, ".json") if disk_dir and max_bytes else None
+        self._lru        = OrderedDict()    # digest -> encoded JSON
+        self._lock       = threading.Lock()
+        self.hits        = 0
+        self.misses      = 0
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.sha256(json.dumps(key, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    # =========================================================
+    # LOOKUP
+    # =========================================================
+    def get(self, key):
+        """A fresh copy of the cached result, or None."""
+        digest = self._digest(key)
+        with self._lock:
+            data = self._lru.get(digest)
+            if data is not None:
+                self._lru.move_to_end(digest)
+            elif self.disk is not None:
+                data = self.disk.get(digest)
+                if data is not None:
+                    self._remember(digest, data)
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(data.decode("utf-8"))
+
+    def put(self, key, value):
+        digest = self._digest(key)
+        data = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self._remember(digest, data)
+            if self.disk is not None:
+                self.disk.put(digest, data)
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            if self.disk is not None:
+                self.disk.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._lru),
+                    "disk_entries": len(self.disk) if self.disk is not None else 0}
+
+    def _remember(self, digest, data):
+        self._lru[digest] = data
+        self._lru.move_to_end(digest)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
@@ -1,41 +1,198 @@
-from symbiont_core.memory_manager import MemoryManager
-from symbiont_core.reflector import Reflector
-from symbiont_core.reflector.reflection_tree_builder import ReflectionTreeBuilder
-
-class SimulationEngine:
-    """
-    Builds a “what-if” tree of possible next states from
-    a starting scenario, using either tagged memories
-    or fresh reflections.
-    """
-    def __init__(self, memory_manager=None, reflector=None, tree_builder=None):
-        self.mem          = memory_manager or MemoryManager()
-        self.reflector    = reflector        or Reflector()
-        self.tree_builder = tree_builder     or ReflectionTreeBuilder()
-
-    def simulate(self, scenario, depth=3, tag_hint=None):
-        """
-        scenario : str          – textual “starting state”
-        depth    : int          – number of projection layers
-        tag_hint : str or None  – if set, biases pulling reflections by this tag
-
-        returns: nested dict { state: [possible_next_state, …], … }
-        """
-        tree    = { scenario: [] }
-        current = [scenario]
-
-        for level in range(depth):
-            next_round = []
-            for state in current:
-                # choose reflections by tag or fresh
-                if tag_hint:
-                    hits = self.mem.search_reflections_by_tag(tag_hint) \
-                                   .get(tag_hint, {}) \
-                                   .get("questions", [])
-                else:
-                    hits = self.reflector.reflect_on_summary([state])
-                tree[state] = hits
-                next_round.extend(hits)
-            current = next_round
-
-        return tree
+import re
+import time
+
+from symbiont_core.memory_manager import MemoryManager
+from symbiont_core.storage import REFLECTIONS
+from symbiont_core.reflector import Reflector
+from symbiont_core.reflector.reflection_tree_builder import ReflectionTreeBuilder
+
+_WORD = re.compile(r"\w+")
+
+
+def overlap_scorer(texts):
+    """
+    Score a state by how many of its words appear in `texts` (e.g. the
+    tagged memories), as a fraction of the state's distinct words.
+    """
+    vocab = {w for t in texts for w in _WORD.findall(t.lower())}
+    def score(state):
+        words = set(_WORD.findall(state.lower()))
+        return len(words & vocab) / len(words) if words else 0.0
+    return score
+
+
+class SimulationResult:
+    """Tree from a bounded simulation plus what the budget cut off."""
+
+    def __init__(self):
+        self.tree     = {}
+        self.scores   = {}
+        self.expanded = 0       # states whose next states were generated
+        self.pruned   = 0       # generated states dropped by the beam / node budget
+        self.stopped  = None    # None, "max_nodes" or "deadline"
+
+    def stats(self):
+        return {"nodes": len(self.scores), "expanded": self.expanded,
+                "pruned": self.pruned, "stopped": self.stopped}
+
+    def to_dict(self):
+        return {"tree": self.tree, "scores": self.scores, "expanded": self.expanded,
+                "pruned": self.pruned, "stopped": self.stopped}
+
+    @classmethod
+    def from_dict(cls, data):
+        result = cls()
+        for name, value in data.items():
+            setattr(result, name, value)
+        return result
+
+
+class SimulationEngine:
+    """
+    Builds a “what-if” tree of possible next states from
+    a starting scenario, using either tagged memories
+    or fresh reflections.
+    """
+    def __init__(self, memory_manager=None, reflector=None, tree_builder=None, cache=None):
+        self.mem          = memory_manager or MemoryManager()
+        self.reflector    = reflector        or Reflector()
+        self.tree_builder = tree_builder     or ReflectionTreeBuilder()
+        self.cache        = cache            # optional SimulationCache
+
+    def _version(self, tag_hint):
+        """
+        Version of the memory a result depends on: the fingerprint of the
+        reflections topic `tag_hint` pulls from (None without a tag_hint).
+        """
+        if not tag_hint:
+            return None
+        return self.mem.fingerprint(REFLECTIONS, tag_hint)
+
+    def simulate(self, scenario, depth=3, tag_hint=None):
+        """
+        scenario : str          – textual “starting state”
+        depth    : int          – number of projection layers
+        tag_hint : str or None  – if set, biases pulling reflections by this tag
+
+        returns: nested dict { state: [possible_next_state, …], … }
+
+        Identical states are expanded once, so the dict is a DAG: a state
+        reached along several paths is one key, and the result grows with
+        the number of unique states rather than branching**depth.
+        """
+        if self.cache is not None:
+            key = ("simulate", scenario, depth, tag_hint, self._version(tag_hint))
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            tree = self._simulate(scenario, depth, tag_hint)
+            self.cache.put(key, tree)
+            return tree
+        return self._simulate(scenario, depth, tag_hint)
+
+    def _simulate(self, scenario, depth, tag_hint):
+        tree    = { scenario: [] }
+        current = [scenario]
+        seen    = { scenario }
+
+        # tagged memories don't depend on the state: look them up once per call
+        if tag_hint:
+            tagged = self._tagged(tag_hint)
+
+        for level in range(depth):
+            next_round = []
+            for state in current:
+                # choose reflections by tag or fresh
+                hits = tagged if tag_hint else self.reflector.reflect_on_summary([state])
+                tree[state] = hits
+                for hit in hits:
+                    if hit not in seen:
+                        seen.add(hit)
+                        next_round.append(hit)
+            current = next_round
+            if not current:
+                break
+
+        return tree
+
+    def _tagged(self, tag_hint):
+        return self.mem.search_reflections_by_tag(tag_hint) \
+                       .get(tag_hint, {}) \
+                       .get("questions", [])
+
+    def simulate_bounded(self, scenario, depth=3, tag_hint=None, beam_width=None,
+                         max_nodes=None, deadline=None, scorer=None):
+        """
+        Beam-search version of `simulate`.
+
+        beam_width : int or None   – states kept per level (best scores first)
+        max_nodes  : int or None   – total states in the result
+        deadline   : float or None – wall-clock seconds before stopping
+        scorer     : state -> float; defaults to overlap_scorer over the
+                     tagged memories (or the scenario when there are none)
+
+        Children that were generated but not kept are left out of the tree,
+        so the result is the best partial tree found within the budget.
+        Results with the default scorer that weren't cut short by the
+        deadline go through `self.cache`.
+        """
+        cacheable = self.cache is not None and scorer is None
+        if cacheable:
+            key = ("bounded", scenario, depth, tag_hint, self._version(tag_hint),
+                   beam_width, max_nodes)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return SimulationResult.from_dict(cached)
+        result = self._simulate_bounded(scenario, depth, tag_hint, beam_width,
+                                        max_nodes, deadline, scorer)
+        if cacheable and result.stopped != "deadline":
+            self.cache.put(key, result.to_dict())
+        return result
+
+    def _simulate_bounded(self, scenario, depth, tag_hint, beam_width, max_nodes, deadline, scorer):
+        started = time.monotonic()
+        result  = SimulationResult()
+        tagged  = self._tagged(tag_hint) if tag_hint else None
+        scorer  = scorer or overlap_scorer(tagged or [scenario])
+
+        tree    = result.tree
+        kept    = result.scores
+        kept[scenario] = scorer(scenario)
+        tree[scenario] = []
+        current = [scenario]
+
+        for level in range(depth):
+            expanded   = {}
+            candidates = []
+            scores     = {}
+            for state in current:
+                if deadline is not None and time.monotonic() - started > deadline:
+                    result.stopped = "deadline"
+                    break
+                hits = tagged if tag_hint else self.reflector.reflect_on_summary([state])
+                expanded[state] = hits
+                result.expanded += 1
+                for hit in hits:
+                    if hit not in kept and hit not in scores:
+                        scores[hit] = scorer(hit)
+                        candidates.append(hit)
+
+            # rank new states; ties keep discovery order (sorted is stable)
+            ranked = sorted(candidates, key=scores.__getitem__, reverse=True)
+            room = len(ranked)
+            if beam_width is not None:
+                room = min(room, beam_width)
+            if max_nodes is not None and len(kept) + room > max_nodes:
+                room = max(0, max_nodes - len(kept))
+                result.stopped = result.stopped or "max_nodes"
+            current = ranked[:room]
+            result.pruned += len(ranked) - room
+            for state in current:
+                kept[state] = scores[state]
+
+            for state, hits in expanded.items():
+                tree[state] = [h for h in hits if h in kept]
+            if result.stopped or not current:
+                break
+
+        return result
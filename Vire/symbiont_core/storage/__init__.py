@@ -0,0 +1,19 @@
+from .base import StorageBackend, normalize_record, SUMMARY, REFLECTIONS, TREE, KINDS
+from .json_backend import JsonDirectoryBackend
+from .sqlite_backend import SqliteBackend
+from .tag_index import TagIndex, parse_tag_query, evaluate_tag_query
+from .tree_file import TreeFile, TreeFileDict, TreeWriter, write_compact_tree
+
+
+def open_backend(kind, root, db_path=None, tree_format="json"):
+    """
+    Build a backend by name.
+      "json"   → JsonDirectoryBackend(root)              (default)
+      "sqlite" → SqliteBackend(db_path or root/memory.sqlite3)
+    tree_format="binary" stores JSON-backend trees as mmap-able .vtree files.
+    """
+    if kind == "sqlite":
+        return SqliteBackend(db_path or (root / "memory.sqlite3"))
+    if kind not in (None, "", "json"):
+        raise ValueError(f"Unknown memory backend: {kind}")
+    return JsonDirectoryBackend(root, tree_format)
@@ -0,0 +1,112 @@
+import contextlib
+
+# Record kinds shared by every backend. They match the JSON file suffixes
+# (`<topic>_summary.json`, `<topic>_reflections.json`, `<topic>_tree.json`).
+SUMMARY     = "summary"
+REFLECTIONS = "reflections"
+TREE        = "tree"
+KINDS       = (SUMMARY, REFLECTIONS, TREE)
+
+# Field holding the list payload of each tagged kind.
+PAYLOAD_FIELD = {SUMMARY: "points", REFLECTIONS: "questions"}
+
+# Marker of a compact tree document (see reflector.compact_tree).
+COMPACT_TREE_FORMAT = "compact-tree/1"
+
+
+def is_compact_tree(data):
+    """True for a compact tree document rather than a {parent: [children]} dict."""
+    return isinstance(data, dict) and data.get("format") == COMPACT_TREE_FORMAT
+
+
+def tree_document(data):
+    """CompactTree objects → their JSON document; anything else unchanged."""
+    return data.to_document() if hasattr(data, "to_document") else data
+
+
+def normalize_record(kind, data):
+    """Apply the legacy patch: bare lists become {"tags": ["legacy"], ...}."""
+    if isinstance(data, list):
+        return {"tags": ["legacy"], PAYLOAD_FIELD[kind]: data}
+    return data
+
+
+class StorageBackend:
+    """
+    Interface behind MemoryManager.
+
+    A backend stores three kinds of record per topic:
+      summary     : {"tags": [...], "points": [...]}
+      reflections : {"tags": [...], "questions": [...]}
+      tree        : {parent: [child, ...], ...} or a compact tree document
+    """
+
+    # =========================================================
+    # RECORDS
+    # =========================================================
+    def save(self, kind, topic, data):
+        raise NotImplementedError
+
+    def load(self, kind, topic):
+        """Return the record, or None if the topic has none of this kind."""
+        raise NotImplementedError
+
+    def load_all(self, kind):
+        """Return {topic: record} for every topic of this kind."""
+        raise NotImplementedError
+
+    def delete(self, kind, topic):
+        raise NotImplementedError
+
+    def list_topics(self, kind):
+        raise NotImplementedError
+
+    # =========================================================
+    # SEARCH
+    # =========================================================
+    def search_by_tag(self, kind, tag):
+        """Return {topic: record} for every record of `kind` tagged `tag`."""
+        matches = {}
+        for topic, data in self.load_all(kind).items():
+            data = normalize_record(kind, data)
+            if tag in data.get("tags", []):
+                matches[topic] = data
+        return matches
+
+    def tag_topics(self, kind, tag):
+        """Posting list: the set of topics of `kind` tagged `tag`."""
+        return set(self.search_by_tag(kind, tag))
+
+    def tagged_topics(self, kind):
+        """Every topic of `kind` (the universe for NOT-only tag queries)."""
+        return set(self.list_topics(kind))
+
+    # =========================================================
+    # CHANGE TRACKING
+    # =========================================================
+    def generation(self):
+        """Counter bumped by every committed write (None if not tracked)."""
+        return None
+
+    def fingerprints(self, kind):
+        """{topic: token} where the token changes whenever the record does."""
+        return {topic: None for topic in self.list_topics(kind)}
+
+    def fingerprint(self, kind, topic):
+        """The fingerprints() token of one topic (None if it is not stored)."""
+        return self.fingerprints(kind).get(topic)
+
+    def watch_paths(self):
+        """Filesystem paths a watcher can observe for changes."""
+        return []
+
+    # =========================================================
+    # TRANSACTIONS
+    # =========================================================
+    @contextlib.contextmanager
+    def batch(self):
+        """Group several writes; backends that can commit once override this."""
+        yield self
+
+    def close(self):
+        pass
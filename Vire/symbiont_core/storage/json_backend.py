@@ -0,0 +1,263 @@
+import contextlib
+import json
+import os
+import pathlib
+import threading
+
+from .base import StorageBackend, SUMMARY, REFLECTIONS, TREE, normalize_record, is_compact_tree, tree_document
+from .tag_index import TagIndex, TAGGED_KINDS, _file_lock
+from .tree_file import TreeFile, TreeFileDict, TreeWriter, write_compact_tree
+
+# One shared index per memory root, so every MemoryManager in a process
+# reuses the same posting lists instead of reloading the journal.
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+class JsonDirectoryBackend(StorageBackend):
+    """
+    Default backend: one pretty-printed JSON file per topic and kind.
+
+      <root>/embeddings/<topic>_summary.json
+      <root>/reflections/<topic>_reflections.json
+      <root>/trees/<topic>_tree.json     (or _tree.vtree with tree_format="binary")
+
+    Tag lookups go through a TagIndex journal at <root>/tag_index.jsonl
+    instead of parsing every file, and <root>/generation counts writes so
+    readers can tell cheaply whether anything changed.
+    """
+
+    def __init__(self, root, tree_format="json"):
+        self.root = pathlib.Path(root)
+        self.tree_format = tree_format
+        self.embeddings_path  = self.root / "embeddings"
+        self.reflections_path = self.root / "reflections"
+        self.trees_path       = self.root / "trees"
+        self.embeddings_path.mkdir(parents=True, exist_ok=True)
+        self.reflections_path.mkdir(parents=True, exist_ok=True)
+        self.trees_path.mkdir(parents=True, exist_ok=True)
+        self._dirs = {
+            SUMMARY:     self.embeddings_path,
+            REFLECTIONS: self.reflections_path,
+            TREE:        self.trees_path,
+        }
+        self.generation_path = self.root / "generation"
+        self.generation_lock = self.root / "generation.lock"
+        self._batch_lock = threading.RLock()
+        self._depth = 0
+        self._dirty = False
+
+    # =========================================================
+    # CHANGE TRACKING
+    # =========================================================
+    def generation(self):
+        try:
+            return int(self.generation_path.read_text(encoding="utf-8") or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _bump(self):
+        if self._depth:
+            self._dirty = True
+            return
+        # other processes (ingest next to live chat) bump too: read-modify-write under a file lock
+        with _file_lock(self.generation_lock):
+            tmp = self.generation_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(str(self.generation() + 1), encoding="utf-8")
+            os.replace(tmp, self.generation_path)
+
+    def fingerprints(self, kind):
+        prints = {}
+        with os.scandir(self._dirs[kind]) as it:
+            for entry in it:
+                for ext in self._extensions(kind):
+                    suffix = f"_{kind}{ext}"
+                    if entry.name.endswith(suffix):
+                        st = entry.stat()
+                        prints[entry.name[:-len(suffix)]] = (st.st_mtime_ns, st.st_size)
+        return prints
+
+    def fingerprint(self, kind, topic):
+        for ext in self._extensions(kind):
+            try:
+                st = os.stat(self.path_for(kind, topic, ext))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            return (st.st_mtime_ns, st.st_size)
+        return None
+
+    def watch_paths(self):
+        return list(self._dirs.values())
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Bump the generation once for all writes inside the block."""
+        with self._batch_lock:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if not self._depth and self._dirty:
+                    self._dirty = False
+                    self._bump()
+
+    # =========================================================
+    # TAG INDEX
+    # =========================================================
+    @property
+    def tag_index(self):
+        """Shared TagIndex for this root, reconciled with the folder on first use."""
+        key = str(self.root.resolve())
+        with _INDEXES_LOCK:
+            index = _INDEXES.get(key)
+            if index is None:
+                index = TagIndex(self.root / "tag_index.jsonl")
+                self._reconcile(index)
+                _INDEXES[key] = index
+        return index
+
+    def _reconcile(self, index):
+        """Index files written without the journal; forget files that vanished."""
+        index.sync()
+        fixes = []
+        for kind in TAGGED_KINDS:
+            on_disk = set(self.list_topics(kind))
+            indexed = index.all_topics(kind)
+            for topic in sorted(on_disk - indexed):
+                try:
+                    data = normalize_record(kind, self.load(kind, topic))
+                except (OSError, json.JSONDecodeError):
+                    continue
+                fixes.append((kind, topic, data.get("tags", [])))
+            fixes.extend((kind, topic, None) for topic in sorted(indexed - on_disk))
+        index.update_many(fixes)
+
+    def rebuild_tag_index(self):
+        """Re-read every tagged file and rewrite the index from scratch."""
+        entries = []
+        for kind in TAGGED_KINDS:
+            for topic, data in self.load_all(kind).items():
+                entries.append((kind, topic, normalize_record(kind, data).get("tags", [])))
+        self.tag_index.rebuild(entries)
+
+    @staticmethod
+    def _extensions(kind):
+        return (".vtree", ".json") if kind == TREE else (".json",)
+
+    def path_for(self, kind, topic, ext=".json"):
+        return self._dirs[kind] / f"{topic}_{kind}{ext}"
+
+    def _existing(self, kind, topic):
+        for ext in self._extensions(kind):
+            file_path = self.path_for(kind, topic, ext)
+            if file_path.exists():
+                return file_path
+        return None
+
+    def _iter_files(self, kind):
+        seen = set()
+        for ext in self._extensions(kind):
+            suffix = f"_{kind}{ext}"
+            for file in self._dirs[kind].glob(f"*{suffix}"):
+                topic = file.name[:-len(suffix)]
+                if topic not in seen:
+                    seen.add(topic)
+                    yield topic, file
+
+    @staticmethod
+    def _read(file_path):
+        if file_path.suffix == ".vtree":
+            with TreeFile(file_path) as tf:
+                return tf.to_document()
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def open_tree_file(self, topic):
+        """Memory-mapped TreeFile for a binary tree (None if it isn't stored as one)."""
+        file_path = self.path_for(TREE, topic, ".vtree")
+        return TreeFile(file_path) if file_path.exists() else None
+
+    def tree_view(self, topic):
+        """Lazy TreeFileDict for a binary tree (None if it isn't stored as one)."""
+        file_path = self.path_for(TREE, topic, ".vtree")
+        return TreeFileDict(file_path) if file_path.exists() else None
+
+    def _save_binary_tree(self, topic, data):
+        # imported here: reflector.compact_tree itself imports storage
+        from symbiont_core.reflector.compact_tree import (
+            CHILD_TEMPLATES, fill_from_dict, fill_from_document)
+        path = self.path_for(TREE, topic, ".vtree")
+        if is_compact_tree(data):
+            # streamed from the document's arrays / the dict, never built as a CompactTree
+            with TreeWriter(path, data["templates"]) as w:
+                fill_from_document(w, data)
+        elif isinstance(data, dict):
+            with TreeWriter(path, CHILD_TEMPLATES) as w:
+                fill_from_dict(w, data)
+        else:
+            write_compact_tree(path, data)
+        stale = self.path_for(TREE, topic, ".json")
+        if stale.exists():
+            stale.unlink()
+
+    # =========================================================
+    # RECORDS
+    # =========================================================
+    def save(self, kind, topic, data):
+        if kind == TREE and self.tree_format == "binary":
+            self._save_binary_tree(topic, data)
+            self._bump()
+            return
+        data = tree_document(data)
+        with open(self.path_for(kind, topic), "w", encoding="utf-8") as f:
+            if is_compact_tree(data):
+                json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+            else:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        if kind == TREE:
+            stale = self.path_for(TREE, topic, ".vtree")
+            if stale.exists():
+                stale.unlink()
+        if kind in TAGGED_KINDS:
+            self.tag_index.update(kind, topic, normalize_record(kind, data).get("tags", []))
+        self._bump()
+
+    def load(self, kind, topic):
+        file_path = self._existing(kind, topic)
+        return self._read(file_path) if file_path else None
+
+    def load_all(self, kind):
+        return {topic: self._read(file) for topic, file in self._iter_files(kind)}
+
+    def delete(self, kind, topic):
+        file_path = self._existing(kind, topic)
+        if not file_path:
+            return
+        for ext in self._extensions(kind):
+            stale = self.path_for(kind, topic, ext)
+            if stale.exists():
+                stale.unlink()
+        if kind in TAGGED_KINDS:
+            self.tag_index.update(kind, topic, None)
+        self._bump()
+
+    def list_topics(self, kind):
+        return [topic for topic, _ in self._iter_files(kind)]
+
+    # =========================================================
+    # SEARCH
+    # =========================================================
+    def search_by_tag(self, kind, tag):
+        matches = {}
+        for topic in self.tag_topics(kind, tag):
+            data = self.load(kind, topic)
+            if data is not None:
+                matches[topic] = normalize_record(kind, data)
+        return matches
+
+    def tag_topics(self, kind, tag):
+        return self.tag_index.topics(kind, tag)
+
+    def tagged_topics(self, kind):
+        return self.tag_index.all_topics(kind)
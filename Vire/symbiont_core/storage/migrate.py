@@ -0,0 +1,48 @@
+"""
+Bulk migration of a JSON `memory/` directory into a SQLite store.
+
+Usage:
+  python -m symbiont_core.storage.migrate [memory_dir] [db_path]
+"""
+import json
+import pathlib
+import sys
+
+from .base import KINDS
+from .json_backend import JsonDirectoryBackend
+from .sqlite_backend import SqliteBackend
+
+
+def migrate_json_to_sqlite(src_root, db_path, batch_size=500, log=print):
+    """
+    Copy every summary, reflection and tree under `src_root` into the
+    SQLite store at `db_path`, committing every `batch_size` records.
+    Existing topics in the store are overwritten. Returns {kind: count}.
+    """
+    src = JsonDirectoryBackend(src_root)
+    dst = SqliteBackend(db_path)
+    counts = {}
+    try:
+        for kind in KINDS:
+            topics = sorted(src.list_topics(kind))
+            counts[kind] = 0
+            for start in range(0, len(topics), batch_size):
+                with dst.batch():
+                    for topic in topics[start:start + batch_size]:
+                        try:
+                            data = src.load(kind, topic)
+                        except (OSError, json.JSONDecodeError) as e:
+                            log(f"⚠️  Skipping {kind} '{topic}': {e}")
+                            continue
+                        dst.save(kind, topic, data)
+                        counts[kind] += 1
+            log(f"✅ Migrated {counts[kind]} {kind} records")
+    finally:
+        dst.close()
+    return counts
+
+
+if __name__ == "__main__":
+    root = pathlib.Path(sys.argv[1]) if len(sys.argv) > 1 else pathlib.Path("memory")
+    db   = pathlib.Path(sys.argv[2]) if len(sys.argv) > 2 else root / "memory.sqlite3"
+    migrate_json_to_sqlite(root, db)
@@ -0,0 +1,257 @@
+import contextlib
+import json
+import pathlib
+import sqlite3
+import threading
+
+from .base import StorageBackend, SUMMARY, REFLECTIONS, TREE, PAYLOAD_FIELD, normalize_record, is_compact_tree, tree_document
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key    TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta(key, value) VALUES ('generation', 0);
+CREATE TABLE IF NOT EXISTS topics (
+    id    INTEGER PRIMARY KEY,
+    name  TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS entries (
+    topic_id  INTEGER NOT NULL REFERENCES topics(id),
+    kind      TEXT    NOT NULL,
+    rev       INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (topic_id, kind)
+);
+CREATE INDEX IF NOT EXISTS entries_kind ON entries(kind);
+CREATE TABLE IF NOT EXISTS points (
+    topic_id  INTEGER NOT NULL,
+    pos       INTEGER NOT NULL,
+    text      TEXT    NOT NULL,
+    PRIMARY KEY (topic_id, pos)
+);
+CREATE TABLE IF NOT EXISTS questions (
+    topic_id  INTEGER NOT NULL,
+    pos       INTEGER NOT NULL,
+    text      TEXT    NOT NULL,
+    PRIMARY KEY (topic_id, pos)
+);
+CREATE TABLE IF NOT EXISTS tags (
+    topic_id  INTEGER NOT NULL,
+    kind      TEXT    NOT NULL,
+    pos       INTEGER NOT NULL,
+    tag       TEXT    NOT NULL,
+    PRIMARY KEY (topic_id, kind, pos)
+);
+CREATE INDEX IF NOT EXISTS tags_by_tag ON tags(tag, kind);
+CREATE TABLE IF NOT EXISTS tree_edges (
+    topic_id   INTEGER NOT NULL,
+    pos        INTEGER NOT NULL,
+    child_pos  INTEGER NOT NULL,
+    parent     TEXT    NOT NULL,
+    child      TEXT,
+    PRIMARY KEY (topic_id, pos, child_pos)
+);
+CREATE TABLE IF NOT EXISTS tree_docs (
+    topic_id  INTEGER PRIMARY KEY,
+    body      TEXT NOT NULL
+);
+"""
+
+# Table holding the payload list of each tagged kind.
+PAYLOAD_TABLE = {SUMMARY: "points", REFLECTIONS: "questions"}
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Single-file backend: topics, points, questions, tags and tree edges
+    live in indexed tables, so tag search is an index lookup instead of
+    a directory scan. Compact tree documents are kept whole in tree_docs.
+
+    Legacy bare-list records are stored with the "legacy" tag, exactly
+    as the JSON backend's search patch would report them.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False,
+                                    isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    # =========================================================
+    # TRANSACTIONS
+    # =========================================================
+    @contextlib.contextmanager
+    def batch(self):
+        """Run every write inside the block in one transaction."""
+        with self._lock:
+            outer = self._depth == 0
+            if outer:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if outer:
+                    self.conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if outer:
+                self.conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # =========================================================
+    # CHANGE TRACKING
+    # =========================================================
+    def generation(self):
+        with self._lock:
+            return self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+
+    def _bump(self):
+        """Advance the generation; called inside the write transaction."""
+        self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+        return self.generation()
+
+    def fingerprints(self, kind):
+        with self._lock:
+            return dict(self.conn.execute(
+                "SELECT t.name, e.rev FROM entries e JOIN topics t ON t.id = e.topic_id "
+                "WHERE e.kind = ?", (kind,)))
+
+    def fingerprint(self, kind, topic):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT e.rev FROM entries e JOIN topics t ON t.id = e.topic_id "
+                "WHERE e.kind = ? AND t.name = ?", (kind, topic)).fetchone()
+        return row[0] if row else None
+
+    def watch_paths(self):
+        return [self.path.parent]
+
+    # =========================================================
+    # HELPERS
+    # =========================================================
+    def _topic_id(self, topic, create=False):
+        row = self.conn.execute("SELECT id FROM topics WHERE name = ?", (topic,)).fetchone()
+        if row:
+            return row[0]
+        if not create:
+            return None
+        return self.conn.execute("INSERT INTO topics(name) VALUES (?)", (topic,)).lastrowid
+
+    def _clear(self, kind, tid):
+        self.conn.execute("DELETE FROM entries WHERE topic_id = ? AND kind = ?", (tid, kind))
+        if kind == TREE:
+            self.conn.execute("DELETE FROM tree_edges WHERE topic_id = ?", (tid,))
+            self.conn.execute("DELETE FROM tree_docs WHERE topic_id = ?", (tid,))
+        else:
+            self.conn.execute(f"DELETE FROM {PAYLOAD_TABLE[kind]} WHERE topic_id = ?", (tid,))
+            self.conn.execute("DELETE FROM tags WHERE topic_id = ? AND kind = ?", (tid, kind))
+
+    def _read(self, kind, tid):
+        if kind == TREE:
+            doc = self.conn.execute("SELECT body FROM tree_docs WHERE topic_id = ?", (tid,)).fetchone()
+            if doc:
+                return json.loads(doc[0])
+            tree = {}
+            rows = self.conn.execute(
+                "SELECT parent, child FROM tree_edges WHERE topic_id = ? "
+                "ORDER BY pos, child_pos", (tid,))
+            for parent, child in rows:
+                children = tree.setdefault(parent, [])
+                if child is not None:
+                    children.append(child)
+            return tree
+        tags = [r[0] for r in self.conn.execute(
+            "SELECT tag FROM tags WHERE topic_id = ? AND kind = ? ORDER BY pos", (tid, kind))]
+        items = [r[0] for r in self.conn.execute(
+            f"SELECT text FROM {PAYLOAD_TABLE[kind]} WHERE topic_id = ? ORDER BY pos", (tid,))]
+        return {"tags": tags, PAYLOAD_FIELD[kind]: items}
+
+    # =========================================================
+    # RECORDS
+    # =========================================================
+    def save(self, kind, topic, data):
+        data = tree_document(data)
+        with self.batch():
+            tid = self._topic_id(topic, create=True)
+            self._clear(kind, tid)
+            self.conn.execute("INSERT INTO entries(topic_id, kind, rev) VALUES (?, ?, ?)",
+                              (tid, kind, self._bump()))
+            if kind == TREE and is_compact_tree(data):
+                self.conn.execute("INSERT INTO tree_docs(topic_id, body) VALUES (?, ?)",
+                                  (tid, json.dumps(data, separators=(",", ":"), ensure_ascii=False)))
+                return
+            if kind == TREE:
+                rows = []
+                for pos, (parent, children) in enumerate(data.items()):
+                    if not children:
+                        rows.append((tid, pos, 0, parent, None))
+                    rows.extend((tid, pos, i, parent, c) for i, c in enumerate(children))
+                self.conn.executemany(
+                    "INSERT INTO tree_edges(topic_id, pos, child_pos, parent, child) "
+                    "VALUES (?, ?, ?, ?, ?)", rows)
+                return
+            data = normalize_record(kind, data)
+            self.conn.executemany(
+                "INSERT INTO tags(topic_id, kind, pos, tag) VALUES (?, ?, ?, ?)",
+                [(tid, kind, i, t) for i, t in enumerate(data.get("tags", []))])
+            self.conn.executemany(
+                f"INSERT INTO {PAYLOAD_TABLE[kind]}(topic_id, pos, text) VALUES (?, ?, ?)",
+                [(tid, i, p) for i, p in enumerate(data.get(PAYLOAD_FIELD[kind], []))])
+
+    def load(self, kind, topic):
+        with self._lock:
+            tid = self._topic_id(topic)
+            if tid is None or not self.conn.execute(
+                    "SELECT 1 FROM entries WHERE topic_id = ? AND kind = ?", (tid, kind)).fetchone():
+                return None
+            return self._read(kind, tid)
+
+    def load_all(self, kind):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT t.id, t.name FROM entries e JOIN topics t ON t.id = e.topic_id "
+                "WHERE e.kind = ?", (kind,)).fetchall()
+            return {name: self._read(kind, tid) for tid, name in rows}
+
+    def delete(self, kind, topic):
+        with self.batch():
+            tid = self._topic_id(topic)
+            if tid is not None:
+                self._clear(kind, tid)
+                self._bump()
+
+    def list_topics(self, kind):
+        with self._lock:
+            return [r[0] for r in self.conn.execute(
+                "SELECT t.name FROM entries e JOIN topics t ON t.id = e.topic_id "
+                "WHERE e.kind = ?", (kind,))]
+
+    # =========================================================
+    # SEARCH
+    # =========================================================
+    def search_by_tag(self, kind, tag):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT t.id, t.name FROM tags g JOIN topics t ON t.id = g.topic_id "
+                "WHERE g.tag = ? AND g.kind = ?", (tag, kind)).fetchall()
+            return {name: self._read(kind, tid) for tid, name in rows}
+
+    def tag_topics(self, kind, tag):
+        with self._lock:
+            return {r[0] for r in self.conn.execute(
+                "SELECT DISTINCT t.name FROM tags g JOIN topics t ON t.id = g.topic_id "
+                "WHERE g.tag = ? AND g.kind = ?", (tag, kind))}
+
+    def tagged_topics(self, kind):
+        return set(self.list_topics(kind))
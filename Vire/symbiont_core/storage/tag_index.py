@@ -0,0 +1,275 @@
+import contextlib
+import json
+import os
+import pathlib
+import threading
+import uuid
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+from .base import SUMMARY, REFLECTIONS
+
+TAGGED_KINDS = (SUMMARY, REFLECTIONS)
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """Exclusive lock on `path` shared by every process using the journal."""
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _epoch_of(line):
+    """The epoch of a compacted journal's header line, else None (old journals have none)."""
+    if line.startswith(b'{"epoch"'):
+        return json.loads(line)["epoch"]
+    return None
+
+
+class TagIndex:
+    """
+    Persistent tag → topic posting lists for the tagged kinds.
+
+    The index is an append-only JSONL journal, one line per save:
+      {"kind": "summary", "topic": "poetry", "tags": ["poetry"]}
+    A line with "tags": null records a deletion. Every process replays
+    the journal on load and tails it (one stat per query) to pick up
+    saves made by other processes; the journal is compacted when it
+    grows well past the number of live entries.
+
+    Compaction writes a new file, headed by {"epoch": …}, and swaps it in,
+    so a reader notices it by the file identity (device, inode) or the
+    epoch changing and replays from the start. Appends and compactions
+    hold an exclusive lock on <journal>.lock, so no process appends to a
+    file that is being replaced.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._lock = threading.RLock()
+        self._postings = {kind: {} for kind in TAGGED_KINDS}   # tag   -> {topic}
+        self._tags     = {kind: {} for kind in TAGGED_KINDS}   # topic -> (tag, ...)
+        self._offset = 0
+        self._lines = 0
+        self._ident = None      # (st_dev, st_ino) of the journal replayed so far
+        self._epoch = None
+
+    # =========================================================
+    # JOURNAL
+    # =========================================================
+    def _reset(self):
+        for kind in TAGGED_KINDS:
+            self._postings[kind].clear()
+            self._tags[kind].clear()
+        self._offset = 0
+        self._lines = 0
+        self._ident = None
+        self._epoch = None
+
+    def _locked(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return _file_lock(self.lock_path)
+
+    def _apply(self, kind, topic, tags):
+        postings = self._postings[kind]
+        for tag in self._tags[kind].pop(topic, ()):
+            posting = postings.get(tag)
+            if posting is not None:
+                posting.discard(topic)
+                if not posting:
+                    del postings[tag]
+        if tags is not None:
+            tags = tuple(dict.fromkeys(tags))
+            self._tags[kind][topic] = tags
+            for tag in tags:
+                postings.setdefault(tag, set()).add(topic)
+
+    def exists(self):
+        return self.path.exists()
+
+    def sync(self):
+        """Replay journal lines appended since the last sync."""
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                return
+            if (st.st_dev, st.st_ino) == self._ident and st.st_size == self._offset:
+                return
+            with open(self.path, "rb") as f:
+                st = os.fstat(f.fileno())       # the file actually opened
+                ident, size = (st.st_dev, st.st_ino), st.st_size
+                header = f.readline()
+                epoch = _epoch_of(header)
+                if ident != self._ident or epoch != self._epoch or size < self._offset:
+                    # first sync, or compacted by another process: replay from scratch
+                    self._reset()
+                    self._ident, self._epoch = ident, epoch
+                    self._offset = len(header) if epoch is not None else 0
+                f.seek(self._offset)
+                data = f.read(size - self._offset)
+            end = data.rfind(b"\n") + 1          # ignore a half-written last line
+            for line in data[:end].splitlines():
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                self._apply(rec["kind"], rec["topic"], rec["tags"])
+                self._lines += 1
+            self._offset += end
+
+    def update_many(self, entries):
+        """Record (kind, topic, tags) entries; tags=None removes the topic."""
+        entries = list(entries)
+        if not entries:
+            return
+        with self._lock, self._locked():
+            self.sync()
+            lines = []
+            for kind, topic, tags in entries:
+                self._apply(kind, topic, tags)
+                lines.append(json.dumps({"kind": kind, "topic": topic,
+                                         "tags": list(tags) if tags is not None else None},
+                                        ensure_ascii=False))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            # our own lines are re-read (idempotently) by the next sync, which
+            # keeps ordering right if another process appended in between
+            if self._lines > 2 * self.size() + 1000:
+                self._compact()
+
+    def update(self, kind, topic, tags):
+        self.update_many([(kind, topic, tags)])
+
+    def compact(self):
+        """Rewrite the journal with one line per live entry."""
+        with self._lock, self._locked():
+            self.sync()
+            self._compact()
+
+    def _compact(self):
+        # caller holds both locks
+        epoch = uuid.uuid4().hex
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"epoch": epoch}) + "\n")
+            for kind in TAGGED_KINDS:
+                for topic, tags in self._tags[kind].items():
+                    f.write(json.dumps({"kind": kind, "topic": topic, "tags": list(tags)},
+                                       ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+        st = os.stat(self.path)
+        self._ident, self._epoch = (st.st_dev, st.st_ino), epoch
+        self._offset = st.st_size
+        self._lines = self.size()
+
+    def rebuild(self, entries):
+        """Replace the whole index with (kind, topic, tags) entries."""
+        with self._lock, self._locked():
+            self._reset()
+            for kind, topic, tags in entries:
+                self._apply(kind, topic, tags)
+            self._compact()
+
+    # =========================================================
+    # LOOKUPS
+    # =========================================================
+    def size(self):
+        return sum(len(t) for t in self._tags.values())
+
+    def topics(self, kind, tag):
+        """Posting list for one tag."""
+        with self._lock:
+            self.sync()
+            return set(self._postings[kind].get(tag, ()))
+
+    def all_topics(self, kind):
+        with self._lock:
+            self.sync()
+            return set(self._tags[kind])
+
+    def tags_of(self, kind, topic):
+        with self._lock:
+            self.sync()
+            return self._tags[kind].get(topic)
+
+    def tag_counts(self, kind):
+        with self._lock:
+            self.sync()
+            return {tag: len(posting) for tag, posting in self._postings[kind].items()}
+
+
+# =========================================================
+# BOOLEAN QUERIES
+# =========================================================
+def parse_tag_query(text):
+    """
+    Parse a tag query into OR-groups of (required, excluded) tags.
+
+      "chess"                 → chess
+      "chess poetry"          → chess AND poetry
+      "chess OR poetry"       → chess OR poetry      ("|" also works)
+      "science -legacy"       → science AND NOT legacy ("NOT x", "!x" also work)
+    """
+    groups = []
+    required, excluded = [], []
+    negate = False
+    for token in text.split():
+        low = token.lower()
+        if low in ("or", "|"):
+            if required or excluded:
+                groups.append((required, excluded))
+            required, excluded, negate = [], [], False
+        elif low == "and":
+            continue
+        elif low == "not":
+            negate = True
+        elif token[0] in "-!" and len(token) > 1:
+            excluded.append(token[1:])
+        elif negate:
+            excluded.append(token)
+            negate = False
+        else:
+            required.append(token)
+    if required or excluded:
+        groups.append((required, excluded))
+    return groups
+
+
+def evaluate_tag_query(groups, lookup, universe):
+    """
+    Evaluate parsed groups. `lookup(tag)` returns a posting set and
+    `universe()` every topic (only needed for purely negative groups).
+
+    AND walks the smallest posting list and probes the others, and NOT
+    probes the exclusions per candidate, so the cost follows the size
+    of the result rather than the corpus.
+    """
+    result = set()
+    for required, excluded in groups:
+        if required:
+            postings = sorted((lookup(t) for t in required), key=len)
+            first, rest = postings[0], postings[1:]
+            candidates = (topic for topic in first if all(topic in p for p in rest))
+        else:
+            candidates = iter(universe())
+        negatives = [lookup(t) for t in excluded]
+        result.update(topic for topic in candidates
+                      if not any(topic in n for n in negatives))
+    return result
@@ -0,0 +1,301 @@
+"""
+Binary reflection-tree files (`*_tree.vtree`).
+
+Layout (little-endian):
+
+  header    magic "VTRE", version, template count, root count,
+            node count, string count, section offsets
+  nodes     per node: parent i32, ref i32, template i8, pad u8
+  children  per node: first_child i32, n_children u32
+            (first_child -1: leaf, -2: expanded but childless)
+  offsets   (string count + 1) × u64 into the blob
+  blob      UTF-8 strings: the templates first, then interned texts
+
+Node and child records are fixed width and strings are reached through
+the offset table, so a reader can mmap the file and visit any node or
+subtree without parsing the rest. The writer streams node records
+straight to disk; only the child and string sections are spooled.
+"""
+import mmap
+import os
+import pathlib
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from collections import deque
+from collections.abc import Mapping
+
+from .base import COMPACT_TREE_FORMAT
+
+MAGIC   = b"VTRE"
+VERSION = 1
+HEADER  = struct.Struct("<4sHHIIIQQQ")
+NODE    = struct.Struct("<iibx")
+CHILD   = struct.Struct("<iI")
+OFFSET  = struct.Struct("<Q")
+
+LITERAL        = -1
+NO_CHILDREN    = -1
+EXPANDED_EMPTY = -2
+
+SPOOL_BYTES = 1 << 20
+
+
+class TreeWriter:
+    """
+    Stream a tree to disk in breadth-first id order.
+
+    Mirrors the CompactTree building API: all `add_root` calls come
+    first, then `add_children(node, items)` with non-decreasing `node`
+    (items are template ids or literal texts). The file is written to a
+    temporary name and moved into place by `close()`.
+    """
+
+    def __init__(self, path, templates):
+        self.path = pathlib.Path(path)
+        self.tmp = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        self.templates = list(templates)
+        self.f = open(self.tmp, "wb")
+        self.f.write(b"\0" * HEADER.size)
+        self.children = tempfile.SpooledTemporaryFile(SPOOL_BYTES)
+        self.blob     = tempfile.SpooledTemporaryFile(SPOOL_BYTES)
+        self.offsets  = array("Q", [0])
+        self._interned = {}
+        for t in self.templates:
+            self._blob(t)
+        self.n_nodes = 0
+        self.n_roots = 0
+        self._next_expand = 0     # first node whose child record isn't written yet
+
+    def _blob(self, text):
+        data = text.encode("utf-8")
+        self.blob.write(data)
+        self.offsets.append(self.offsets[-1] + len(data))
+
+    def _string(self, text):
+        """Intern a literal text; returns its index among the literals."""
+        idx = self._interned.get(text)
+        if idx is None:
+            self._blob(text)
+            idx = self._interned[text] = len(self._interned)
+        return idx
+
+    def _node(self, parent, template, ref):
+        self.f.write(NODE.pack(parent, ref, template))
+        self.n_nodes += 1
+        return self.n_nodes - 1
+
+    def add_root(self, text):
+        if self.n_nodes != self.n_roots:
+            raise ValueError("roots must be added before any children")
+        self.n_roots += 1
+        return self._node(-1, LITERAL, self._string(text))
+
+    def _close_until(self, node):
+        while self._next_expand < node:
+            self.children.write(CHILD.pack(NO_CHILDREN, 0))
+            self._next_expand += 1
+
+    def add_children(self, node, items):
+        if node < self._next_expand or node >= self.n_nodes:
+            raise ValueError(f"children must be added in node order (got {node})")
+        self._close_until(node)
+        start = self.n_nodes
+        for item in items:
+            if isinstance(item, int):
+                self._node(node, item, -1)
+            else:
+                self._node(node, LITERAL, self._string(item))
+        count = self.n_nodes - start
+        self.children.write(CHILD.pack(start if count else EXPANDED_EMPTY, count))
+        self._next_expand = node + 1
+        return range(start, start + count)
+
+    def close(self):
+        self._close_until(self.n_nodes)
+        children_off = self.f.tell()
+        self.children.seek(0)
+        shutil.copyfileobj(self.children, self.f)
+        offsets_off = self.f.tell()
+        if sys.byteorder == "big":
+            self.offsets.byteswap()
+        self.f.write(self.offsets.tobytes())
+        blob_off = self.f.tell()
+        self.blob.seek(0)
+        shutil.copyfileobj(self.blob, self.f)
+        self.f.seek(0)
+        self.f.write(HEADER.pack(MAGIC, VERSION, len(self.templates), self.n_roots,
+                                 self.n_nodes, len(self.offsets) - 1,
+                                 children_off, offsets_off, blob_off))
+        self.f.close()
+        self.children.close()
+        self.blob.close()
+        os.replace(self.tmp, self.path)
+
+    def abort(self):
+        self.f.close()
+        self.children.close()
+        self.blob.close()
+        if self.tmp.exists():
+            self.tmp.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_compact_tree(path, tree):
+    """Write a CompactTree (or anything with its arrays) to a .vtree file."""
+    with TreeWriter(path, tree.templates) as w:
+        for node in range(len(tree.parent)):
+            if tree.parent[node] == -1:
+                w.add_root(tree.strings[tree.ref[node]])
+        for node in range(len(tree.parent)):
+            kids = range(tree.first_child[node], tree.first_child[node] + tree.n_children[node]) \
+                if tree.n_children[node] else ()
+            if not kids and node not in tree.leaf_keys:
+                continue
+            ids = w.add_children(node, [tree.template[c] if tree.template[c] != LITERAL
+                                        else tree.strings[tree.ref[c]] for c in kids])
+            if kids and ids.start != kids.start:
+                raise ValueError("tree is not in breadth-first layout")
+
+
+class TreeFile:
+    """Memory-mapped reader for .vtree files; nodes are decoded on access."""
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.n_templates, self.n_roots, self.n_nodes,
+         self.n_strings, self._children_off, self._offsets_off, self._blob_off) = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} tree file")
+        self.templates = [self.string(i) for i in range(self.n_templates)]
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.n_nodes
+
+    # =========================================================
+    # RECORDS
+    # =========================================================
+    def string(self, idx):
+        start, = OFFSET.unpack_from(self._mm, self._offsets_off + idx * OFFSET.size)
+        end,   = OFFSET.unpack_from(self._mm, self._offsets_off + (idx + 1) * OFFSET.size)
+        return self._mm[self._blob_off + start:self._blob_off + end].decode("utf-8")
+
+    def node(self, i):
+        """(parent, template, literal string index or -1)."""
+        parent, ref, template = NODE.unpack_from(self._mm, HEADER.size + i * NODE.size)
+        return parent, template, ref
+
+    def children(self, i):
+        first, count = CHILD.unpack_from(self._mm, self._children_off + i * CHILD.size)
+        return range(first, first + count) if count else range(0)
+
+    def is_expanded(self, i):
+        first, count = CHILD.unpack_from(self._mm, self._children_off + i * CHILD.size)
+        return count > 0 or first == EXPANDED_EMPTY
+
+    def roots(self):
+        return range(self.n_roots)
+
+    def text(self, i):
+        chain = []
+        parent, template, ref = self.node(i)
+        while template != LITERAL:
+            chain.append(template)
+            parent, template, ref = self.node(parent)
+        text = self.string(self.n_templates + ref)
+        for tid in reversed(chain):
+            text = self.templates[tid].format(text)
+        return text
+
+    # =========================================================
+    # WALKS
+    # =========================================================
+    def subtree(self, i, max_depth=None):
+        """Pre-order (node, depth) pairs under node `i`, reading only those records."""
+        stack = [(i, 0)]
+        while stack:
+            node, depth = stack.pop()
+            yield node, depth
+            if max_depth is None or depth < max_depth:
+                stack.extend((c, depth + 1) for c in reversed(self.children(node)))
+
+    def iter_bfs(self):
+        queue = deque(self.roots())
+        while queue:
+            node = queue.popleft()
+            yield node
+            queue.extend(self.children(node))
+
+    def to_document(self):
+        """Decode everything into a compact tree document."""
+        nodes = [self.node(i) for i in range(self.n_nodes)]
+        return {
+            "format":    COMPACT_TREE_FORMAT,
+            "templates": self.templates,
+            "strings":   [self.string(i) for i in range(self.n_templates, self.n_strings)],
+            "parent":    [n[0] for n in nodes],
+            "template":  [n[1] for n in nodes],
+            "ref":       [n[2] for n in nodes],
+            "leaf_keys": [i for i in range(self.n_nodes)
+                          if not self.children(i) and self.is_expanded(i)],
+        }
+
+    def to_dict(self):
+        tree = {}
+        for node in self.iter_bfs():
+            if self.is_expanded(node):
+                tree[self.text(node)] = [self.text(c) for c in self.children(node)]
+        return tree
+
+
+class TreeFileDict(Mapping):
+    """
+    Read-only {parent: [children]} view of a .vtree file. Nothing is read
+    until the first lookup; then the file is mapped, decoded once
+    (TreeFile.to_dict) and closed, so holding many views costs no file handles.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self._tree = None
+
+    def _data(self):
+        if self._tree is None:
+            try:
+                with TreeFile(self.path) as tf:
+                    self._tree = tf.to_dict()
+            except FileNotFoundError:       # deleted since; the next refresh drops it
+                self._tree = {}
+        return self._tree
+
+    def __getitem__(self, key):
+        return self._data()[key]
+
+    def __iter__(self):
+        return iter(self._data())
+
+    def __len__(self):
+        return len(self._data())
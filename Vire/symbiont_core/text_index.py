@@ -0,0 +1,106 @@
+import random
+
+
+def normalize_text(text):
+    """Lowercase and collapse whitespace, so phrase lookups ignore spacing."""
+    return " ".join(text.lower().split())
+
+
+class TextIndex:
+    """
+    Trigram inverted index over memory texts (summary points, reflections,
+    tree nodes), used by live_chat's fuzzy fallback.
+
+    Lowercase forms are computed once when a text is added. A substring or
+    phrase query of 3+ characters intersects the posting lists of its
+    trigrams (walking the shortest one) and only verifies those
+    candidates; shorter queries fall back to a scan of the precomputed
+    lowercase forms. Texts are grouped per (kind, topic) so one topic can
+    be replaced without rebuilding the index.
+    """
+
+    N = 3
+
+    def __init__(self):
+        self._docs  = {}    # doc id -> (kind, topic, text)
+        self._lower = {}    # doc id -> normalized text
+        self._grams = {}    # trigram -> {doc id}
+        self._by_topic = {} # (kind, topic) -> [doc id, ...]
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    @classmethod
+    def grams(cls, text):
+        return {text[i:i + cls.N] for i in range(len(text) - cls.N + 1)}
+
+    # =========================================================
+    # UPDATES
+    # =========================================================
+    def add(self, kind, topic, texts):
+        """Index `texts` under (kind, topic), replacing what was there."""
+        self.remove(kind, topic)
+        ids = []
+        for text in dict.fromkeys(texts):
+            if not isinstance(text, str):
+                continue
+            doc = self._next_id
+            self._next_id += 1
+            low = normalize_text(text)
+            self._docs[doc] = (kind, topic, text)
+            self._lower[doc] = low
+            for gram in self.grams(low):
+                self._grams.setdefault(gram, set()).add(doc)
+            ids.append(doc)
+        self._by_topic[(kind, topic)] = ids
+
+    def remove(self, kind, topic):
+        for doc in self._by_topic.pop((kind, topic), ()):
+            for gram in self.grams(self._lower.pop(doc)):
+                posting = self._grams.get(gram)
+                if posting is not None:
+                    posting.discard(doc)
+                    if not posting:
+                        del self._grams[gram]
+            del self._docs[doc]
+
+    # =========================================================
+    # LOOKUPS
+    # =========================================================
+    def _candidates(self, q):
+        if len(q) < self.N:
+            return iter(self._lower)
+        postings = []
+        for gram in self.grams(q):
+            posting = self._grams.get(gram)
+            if not posting:
+                return iter(())
+            postings.append(posting)
+        postings.sort(key=len)
+        first, rest = postings[0], postings[1:]
+        return (doc for doc in first if all(doc in p for p in rest))
+
+    def iter_matches(self, query):
+        """Yield (kind, topic, text) for every text containing `query`."""
+        q = normalize_text(query)
+        if not q:
+            return
+        for doc in self._candidates(q):
+            if q in self._lower[doc]:
+                yield self._docs[doc]
+
+    def sample(self, query, k=1, rng=random):
+        """
+        Uniform random sample of up to `k` matches (reservoir sampling),
+        without collecting the full match list.
+        """
+        reservoir = []
+        for seen, match in enumerate(self.iter_matches(query)):
+            if seen < k:
+                reservoir.append(match)
+            else:
+                j = rng.randint(0, seen)
+                if j < k:
+                    reservoir[j] = match
+        return reservoir
@@ -1 +1 @@
-﻿def load_json(path):\n    import json; return json.load(open(path, encoding='utf-8'))
+﻿def load_json(path):\n    import json; return json.load(open(path, encoding='utf-8'))
@@ -0,0 +1,120 @@
+import os
+import pathlib
+import threading
+
+# Optional: watchdog gives inotify / FSEvents / ReadDirectoryChangesW
+# notifications; without it we poll file stats in a background thread.
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+
+class _Handler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if getattr(event, "is_directory", False):
+            return
+        self.watcher._mark(event.src_path)
+        dest = getattr(event, "dest_path", None)
+        if dest:
+            self.watcher._mark(dest)
+
+
+class ChangeWatcher:
+    """
+    Collects paths of files that changed under a set of directories.
+
+    The prompt thread only calls `pending()` / `drain()`, which cost a
+    flag check, so a refresh with nothing changed is essentially free.
+    Uses watchdog when installed, otherwise a polling thread that compares
+    (mtime, size) every `interval` seconds.
+    """
+
+    def __init__(self, paths, suffixes=(".json",), interval=1.0, recursive=False):
+        self.paths = [pathlib.Path(p) for p in paths]
+        self.suffixes = tuple(suffixes)
+        self.interval = interval
+        self.recursive = recursive
+        self._lock = threading.Lock()
+        self._changed = set()
+        self._stop = threading.Event()
+        self._observer = None
+        self._thread = None
+
+    def _mark(self, path):
+        if str(path).endswith(self.suffixes):
+            with self._lock:
+                self._changed.add(str(path))
+
+    # =========================================================
+    # LIFECYCLE
+    # =========================================================
+    def start(self):
+        if Observer is not None:
+            self._observer = Observer()
+            handler = _Handler(self)
+            for p in self.paths:
+                if p.exists():
+                    self._observer.schedule(handler, str(p), recursive=self.recursive)
+            self._observer.daemon = True
+            self._observer.start()
+        else:
+            self._last = self._scan()      # baseline before start() returns
+            self._thread = threading.Thread(target=self._poll, name="change-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+
+    # =========================================================
+    # POLLING FALLBACK
+    # =========================================================
+    def _scan(self):
+        stats = {}
+        for root in self.paths:
+            if not root.exists():
+                continue
+            walker = os.walk(root) if self.recursive else [(str(root), None, os.listdir(root))]
+            for dirpath, _, names in walker:
+                for name in names:
+                    if name.endswith(self.suffixes):
+                        full = os.path.join(dirpath, name)
+                        try:
+                            st = os.stat(full)
+                        except FileNotFoundError:
+                            continue
+                        stats[full] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+    def _poll(self):
+        last = self._last
+        while not self._stop.wait(self.interval):
+            current = self._scan()
+            for path in set(last) | set(current):
+                if last.get(path) != current.get(path):
+                    self._mark(path)
+            last = current
+
+    # =========================================================
+    # CONSUMERS
+    # =========================================================
+    def pending(self):
+        return bool(self._changed)
+
+    def mark(self, path):
+        """Report a change made in-process without waiting for the watcher."""
+        self._mark(path)
+
+    def drain(self):
+        """Return and clear the set of changed paths."""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
@@ -0,0 +1,76 @@
+"""
+Startup benchmark for live_chat.
+
+Imports live_chat in fresh interpreters (everything up to the first
+prompt) and reports wall time, live_chat's own STARTUP_SECONDS and any
+heavy modules that got loaded before a command asked for them. Exits
+non-zero when a budget is exceeded, so it can guard against startup
+regressions:
+
+    python training_pipeline/bench_startup.py --runs 10 --max-seconds 1.5
+"""
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+import time
+
+PIPELINE = pathlib.Path(__file__).resolve().parent
+
+# only needed once a plugin command runs
+HEAVY = ("chess", "chess.engine", "chess.pgn", "http.client", "ssl",
+         "symbiont_core.http_client", "symbiont_core.engine_pool")
+
+CHILD = f"""
+import json, sys
+sys.path.insert(0, {str(PIPELINE)!r})
+import live_chat
+print(json.dumps({{"startup": live_chat.STARTUP_SECONDS,
+                  "heavy": [m for m in {HEAVY!r} if m in sys.modules],
+                  "commands": len(live_chat.REGISTRY)}}))
+"""
+
+def run_once():
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", CHILD], capture_output=True, text=True,
+                         encoding="utf-8", check=True).stdout
+    wall = time.perf_counter() - started
+    return wall, json.loads(out.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure live_chat startup time.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="fail if the median wall time is above this")
+    parser.add_argument("--allow-heavy", action="store_true",
+                        help="do not fail when heavy modules are imported at startup")
+    args = parser.parse_args()
+
+    walls, startups, heavy, commands = [], [], set(), 0
+    for _ in range(max(1, args.runs)):
+        wall, report = run_once()
+        walls.append(wall)
+        startups.append(report["startup"])
+        heavy.update(report["heavy"])
+        commands = report["commands"]
+
+    print(f"⏱️  live_chat startup over {len(walls)} run(s), {commands} commands registered")
+    print(f"   wall (incl. interpreter): median {statistics.median(walls):.3f}s, "
+          f"min {min(walls):.3f}s")
+    print(f"   module import:            median {statistics.median(startups):.3f}s, "
+          f"min {min(startups):.3f}s")
+
+    failed = False
+    if heavy:
+        print(f"   heavy modules at startup: {', '.join(sorted(heavy))}")
+        failed = not args.allow_heavy
+    if args.max_seconds is not None and statistics.median(walls) > args.max_seconds:
+        print(f"⚠️  Median {statistics.median(walls):.3f}s is over the {args.max_seconds:.3f}s budget.")
+        failed = True
+    print("❌ Startup regression." if failed else "✅ Startup within budget.")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1 +1 @@
-﻿def fine_tune(): print("TODO fine-tune")
+﻿def fine_tune(): print("TODO fine-tune")
@@ -1,100 +1,324 @@
-﻿import sys
-import pathlib
-
-# --- Setup Paths ---
-sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
-
-# --- Imports ---
-from symbiont_core.learner import Learner
-from symbiont_core.reflector import Reflector
-from symbiont_core.memory_manager import MemoryManager
-from symbiont_core.reflector.reflection_tree_builder import ReflectionTreeBuilder
-
-# =========================================================
-# HELPER FUNCTIONS
-# =========================================================
-def guess_tags(filename):
-    """Generate default tags based on filename."""
-    tags = []
-    name = filename.lower()
-
-    if 'chess' in name:
-        tags.append('chess')
-    if 'poetry' in name:
-        tags.append('poetry')
-    if 'science' in name:
-        tags.append('science')
-    if 'philosophy' in name:
-        tags.append('philosophy')
-
-    if not tags:
-        tags.append('general')
-
-    return tags
-
-# =========================================================
-# INGESTION PIPELINE
-# =========================================================
-class Ingestor:
-    def __init__(self):
-        self.learner = Learner()
-        self.reflector = Reflector()
-        self.memory = MemoryManager()
-        self.tree_builder = ReflectionTreeBuilder()
-
-    def load_inputs(self):
-        """List available input files."""
-        return self.learner.list_inputs()
-
-    def process_file(self, file):
-        """Process a single input file."""
-        safe_name = file.name.replace('.txt', '')
-        print(f"\nIngesting: {file.name}")
-
-        text = self.learner.load_input(file.name)
-        if not text:
-            print(f"❌ Failed to load {file.name}")
-            return
-
-        summary = self.learner.summarize(text)
-        if not summary:
-            print(f"⚠️ No summary generated for {file.name}")
-            return
-
-        # Print summary
-        print("\nSummary:")
-        for idx, point in enumerate(summary, 1):
-            print(f"{idx}. {point}")
-
-        reflections = self.reflector.reflect_on_summary(summary)
-
-        # Print reflections
-        print("\nReflections:")
-        for q in reflections:
-            print(f"- {q}")
-
-        tags = guess_tags(file.name)
-        self.memory.save_summary(safe_name, summary, tags=tags)
-        self.memory.save_reflections(safe_name, reflections, tags=tags)
-        print(f"✅ Saved summary and reflections for {safe_name} with tags {tags}")
-
-        tree = self.tree_builder.grow_tree(reflections, layers=2)
-        self.memory.save_tree(safe_name, tree)
-        print(f"🌳 Saved reflection tree for {safe_name}")
-
-    def ingest_all(self):
-        """Ingest all available inputs."""
-        files = self.load_inputs()
-        if not files:
-            print("No files to ingest.")
-            return
-
-        for file in files:
-            self.process_file(file)
-
-# =========================================================
-# MAIN EXECUTION
-# =========================================================
-if __name__ == '__main__':
-    ingestor = Ingestor()
-    ingestor.ingest_all()
+﻿import argparse
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
+import sys
+import pathlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# --- Setup Paths ---
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+# --- Imports ---
+from symbiont_core.learner import Learner
+from symbiont_core.reflector import Reflector
+from symbiont_core.memory_manager import MemoryManager, MEMORY_ROOT
+from symbiont_core.reflector.reflection_tree_builder import ReflectionTreeBuilder
+from symbiont_core.reflector.compact_tree import CompactTree, CHILD_TEMPLATES
+
+# Trees with at least this many nodes are grown one root per worker process
+FANOUT_NODES = 100_000
+
+# =========================================================
+# HELPER FUNCTIONS
+# =========================================================
+def guess_tags(filename):
+    """Generate default tags based on filename."""
+    tags = []
+    name = filename.lower()
+
+    if 'chess' in name:
+        tags.append('chess')
+    if 'poetry' in name:
+        tags.append('poetry')
+    if 'science' in name:
+        tags.append('science')
+    if 'philosophy' in name:
+        tags.append('philosophy')
+
+    if not tags:
+        tags.append('general')
+
+    return tags
+
+def tree_nodes(roots, layers):
+    """Node count of a reflection tree with `roots` roots grown `layers` deep."""
+    return roots * sum(len(CHILD_TEMPLATES) ** depth for depth in range(layers + 1))
+
+def grow_root(reflection, layers=2):
+    """The reflection tree of one root: the unit of work when a deep tree is fanned out."""
+    return ReflectionTreeBuilder().grow_compact([reflection], layers=layers)
+
+def digest_file(path, layers=2, fanout_nodes=None):
+    """
+    CPU stages for one input: stream-summarize, reflect, build the tree.
+    Runs in worker processes, so it touches no shared state; console output
+    is captured and returned so the parent can print it in input order.
+    A tree of `fanout_nodes` or more is left as None for the parent to
+    fan out by root. Returns (safe_name, result or None, captured output).
+    """
+    path = pathlib.Path(path)
+    out = io.StringIO()
+    result = None
+    with contextlib.redirect_stdout(out):
+        print(f"\nIngesting: {path.name}")
+        learner = Learner(path.parent)
+        summary = learner.summarize_file(path.name)
+        if summary is None:
+            print(f"❌ Failed to load {path.name}")
+        else:
+            print("\nSummary:")
+            for idx, point in enumerate(summary, 1):
+                print(f"{idx}. {point}")
+
+            reflections = Reflector().reflect_on_summary(summary)
+            print("\nReflections:")
+            for q in reflections:
+                print(f"- {q}")
+
+            fan_out = (fanout_nodes and len(reflections) > 1
+                       and tree_nodes(len(reflections), layers) >= fanout_nodes)
+            result = {
+                "summary":     summary,
+                "reflections": reflections,
+                "tags":        guess_tags(path.name),
+                "tree":        None if fan_out else
+                               ReflectionTreeBuilder().grow_compact(reflections, layers=layers),
+            }
+    return path.name.replace('.txt', ''), result, out.getvalue()
+
+def file_hash(path):
+    """sha256 of a file's bytes, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+# =========================================================
+# INGESTION MANIFEST
+# =========================================================
+MANIFEST_VERSION = 1
+
+class IngestManifest:
+    """
+    What was ingested from each input: size, mtime, content hash and the
+    topic it was saved under, plus the pipeline parameters of the run.
+
+    Unchanged (size, mtime) means unchanged without reading the file; a
+    differing stat is confirmed with the hash, so a touched-but-identical
+    file is not reprocessed. Different parameters reprocess everything.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.params = None
+        self.files = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                doc = json.load(f)
+            if doc.get("version") == MANIFEST_VERSION:
+                self.params = doc.get("params")
+                self.files = doc.get("files", {})
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def plan(self, inputs_path, params, force=False):
+        """
+        Compare the inputs folder with the manifest.
+        Returns (todo, removed, unchanged): todo is [(path, stat entry)] to
+        (re)ingest, removed the names of inputs that no longer exist.
+
+        With new parameters (or `force`) the entries of current inputs are
+        dropped, so a run that is interrupted leaves the rest to reprocess.
+        """
+        reuse = not force and params == self.params
+        current = {}
+        if inputs_path.exists():
+            with os.scandir(inputs_path) as it:
+                for entry in it:
+                    if entry.name.endswith(".txt") and entry.is_file():
+                        st = entry.stat()
+                        current[entry.name] = (st.st_size, st.st_mtime_ns)
+
+        todo, unchanged = [], 0
+        for name in sorted(current):
+            size, mtime_ns = current[name]
+            if not reuse:
+                # keep the old topic on the todo entry so its outputs can still be dropped
+                stale = self.files.pop(name, None)
+                path = inputs_path / name
+                todo.append((path, {"size": size, "mtime_ns": mtime_ns,
+                                    "sha256": file_hash(path),
+                                    "topic": stale.get("topic") if stale else None}))
+                continue
+            old = self.files.get(name)
+            if old and old["size"] == size and old["mtime_ns"] == mtime_ns:
+                unchanged += 1
+                continue
+            path = inputs_path / name
+            sha = file_hash(path)
+            if old and old["sha256"] == sha:
+                old.update(size=size, mtime_ns=mtime_ns)
+                unchanged += 1
+                continue
+            todo.append((path, {"size": size, "mtime_ns": mtime_ns, "sha256": sha}))
+
+        removed = [name for name in self.files if name not in current]
+        self.params = params
+        return todo, removed, unchanged
+
+    def record(self, name, entry, topic):
+        self.files[name] = dict(entry, topic=topic)
+
+    def forget(self, name):
+        """Drop an input; returns the topic its outputs were saved under (or None)."""
+        entry = self.files.pop(name, None)
+        return entry.get("topic") if entry else None
+
+    def save(self):
+        doc = {"version": MANIFEST_VERSION, "params": self.params, "files": self.files}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(doc, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+# =========================================================
+# INGESTION PIPELINE
+# =========================================================
+class Ingestor:
+    def __init__(self, manifest_path=None):
+        self.learner = Learner()
+        self.reflector = Reflector()
+        self.memory = MemoryManager()
+        self.tree_builder = ReflectionTreeBuilder()
+        self.manifest_path = pathlib.Path(manifest_path or MEMORY_ROOT / "ingest_manifest.json")
+
+    def load_inputs(self):
+        """List available input files."""
+        return self.learner.list_inputs()
+
+    def process_file(self, file):
+        """Process a single input file."""
+        safe_name, result, output = digest_file(file)
+        print(output, end="")
+        if result:
+            self.store(safe_name, result)
+        return result is not None
+
+    def store(self, safe_name, result):
+        """Write one digested file's summary, reflections and tree."""
+        tags = result["tags"]
+        self.memory.save_summary(safe_name, result["summary"], tags=tags)
+        self.memory.save_reflections(safe_name, result["reflections"], tags=tags)
+        print(f"✅ Saved summary and reflections for {safe_name} with tags {tags}")
+
+        self.memory.save_tree(safe_name, result["tree"])
+        print(f"🌳 Saved reflection tree for {safe_name}")
+
+    def ingest_all(self, workers=1, batch_size=64, layers=2, force=False, fanout_nodes=FANOUT_NODES):
+        """
+        Ingest new or modified inputs.
+
+        The manifest (see IngestManifest) decides what to skip; outputs of
+        inputs that were deleted are removed. With workers > 1 the CPU
+        stages run in a process pool; results come back in input order, so
+        console output matches a serial run, and are written `batch_size`
+        files per memory transaction. Trees of `fanout_nodes` or more are
+        grown one root per task on the same pool and merged back in the
+        order a serial build gives.
+        """
+        manifest = IngestManifest(self.manifest_path)
+        todo, removed, unchanged = manifest.plan(self.learner.inputs_path,
+                                                 {"layers": layers}, force=force)
+        try:
+            if removed:
+                with self.memory.batch():
+                    for name in removed:
+                        topic = manifest.forget(name)
+                        if topic:
+                            self.memory.delete_topic(topic)
+                            print(f"🗑️ Removed outputs of deleted input {name}")
+            if not todo:
+                if unchanged or removed:
+                    print(f"✅ Nothing to ingest ({unchanged} unchanged input(s)).")
+                else:
+                    print("No files to ingest.")
+                return
+            self._ingest(manifest, todo, workers, batch_size, layers, unchanged, fanout_nodes)
+        finally:
+            manifest.save()
+
+    def _ingest(self, manifest, todo, workers, batch_size, layers, unchanged, fanout_nodes):
+        started = time.perf_counter()
+        ingested = 0
+        files = [path for path, _ in todo]
+        if workers <= 1:
+            digests = map(functools.partial(digest_file, layers=layers), files)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            chunksize = max(1, len(files) // (workers * 8))
+            digest = functools.partial(digest_file, layers=layers, fanout_nodes=fanout_nodes)
+            digests = pool.map(digest, files, chunksize=chunksize)
+        try:
+            pending = []
+            for item, result in zip(todo, digests):
+                digested = result[1]
+                if digested and digested["tree"] is None:
+                    grow = functools.partial(grow_root, layers=layers)
+                    digested["tree"] = CompactTree.merge(pool.map(grow, digested["reflections"]))
+                pending.append((item, result))
+                if len(pending) >= batch_size:
+                    ingested += self._flush(manifest, pending)
+            ingested += self._flush(manifest, pending)
+        finally:
+            if pool:
+                pool.shutdown()
+
+        elapsed = time.perf_counter() - started
+        rate = len(files) / elapsed if elapsed else float("inf")
+        print(f"\n📊 Ingested {ingested}/{len(files)} files in {elapsed:.2f}s "
+              f"({rate:.1f} files/s, {max(workers, 1)} worker(s), {unchanged} unchanged skipped)")
+
+    def _flush(self, manifest, pending):
+        """Print and store buffered digests in one batch; returns how many were saved."""
+        saved = 0
+        with self.memory.batch():
+            for (path, entry), (safe_name, result, output) in pending:
+                print(output, end="")
+                if result:
+                    self.store(safe_name, result)
+                    manifest.record(path.name, entry, safe_name)
+                    saved += 1
+                else:
+                    # no usable content (any more): drop old outputs, skip it until it changes
+                    stale = manifest.forget(path.name) or entry.get("topic")
+                    if stale:
+                        self.memory.delete_topic(stale)
+                    manifest.record(path.name, entry, None)
+        pending.clear()
+        return saved
+
+# =========================================================
+# MAIN EXECUTION
+# =========================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Ingest memory/inputs/*.txt into memory.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for the CPU stages (0 = one per CPU core)")
+    parser.add_argument("--layers", type=int, default=2, help="reflection tree depth")
+    parser.add_argument("--fanout-nodes", type=int, default=FANOUT_NODES,
+                        help="with --workers, grow trees of this many nodes one root per process")
+    parser.add_argument("--force", action="store_true",
+                        help="reprocess every input, ignoring the ingestion manifest")
+    args = parser.parse_args()
+
+    ingestor = Ingestor()
+    ingestor.ingest_all(workers=args.workers or os.cpu_count() or 1,
+                        layers=args.layers, force=args.force, fanout_nodes=args.fanout_nodes)
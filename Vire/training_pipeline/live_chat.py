@@ -1,318 +1,775 @@
-# File: training_pipeline/live_chat.py
-
-"""
-Live Chat CLI for Symbiont:
-- Memory search (tag-based)
-- Reflection trees
-- What-if simulations
-- Dynamic plugin loading
-- Command aliases, shlex parsing, default depths
-- Hot-reload core modules
-- Ctrl-C guard
-- Automatic learning prompt
-"""
-
-import sys
-import pathlib
-import json
-import importlib
-import importlib.util
-import shlex
-import random
-import datetime
-import traceback
-import types
-
-# -------------------------------------------------------------------
-# Project root path
-# -------------------------------------------------------------------
-PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
-sys.path.append(str(PROJECT_ROOT))
-
-# -------------------------------------------------------------------
-# Optional readline for history
-# -------------------------------------------------------------------
-try:
-    import readline  # Unix
-except ImportError:
-    try:
-        import pyreadline3 as readline  # Windows
-    except ImportError:
-        readline = None
-
-# -------------------------------------------------------------------
-# Hot-reload helper
-# -------------------------------------------------------------------
-def hot_reload(module: types.ModuleType):
-    try:
-        importlib.reload(module)
-    except Exception:
-        traceback.print_exc()
-
-# -------------------------------------------------------------------
-# Import & reload core modules
-# -------------------------------------------------------------------
-import symbiont_core.memory_manager          as _mm;  hot_reload(_mm)
-import symbiont_core.reflector               as _rf;  hot_reload(_rf)
-import symbiont_core.reflector.reflection_tree_builder as _rtb; hot_reload(_rtb)
-import symbiont_core.simulation_sandbox      as _ssb; hot_reload(_ssb)
-
-MemoryManager         = _mm.MemoryManager
-Reflector             = _rf.Reflector
-ReflectionTreeBuilder = _rtb.ReflectionTreeBuilder
-SimulationEngine      = _ssb.SimulationEngine
-
-# -------------------------------------------------------------------
-# Load config (handle BOM)
-# -------------------------------------------------------------------
-cfg = {
-    "tree_default": 2,
-    "sim_default": 3,
-    "aliases": {
-        "s":    "search", "se": "search",
-        "t":    "tree",   "tr": "tree",
-        "sim":  "simulate",
-        "h":    "help",   "?":  "help",
-        "q":    "exit",   "quit":"exit"
-    }
-}
-config_path = PROJECT_ROOT / "config" / "settings.json"
-if config_path.exists():
-    try:
-        with open(config_path, encoding="utf-8-sig") as f:
-            cfg.update(json.load(f))
-    except Exception:
-        traceback.print_exc()
-
-# -------------------------------------------------------------------
-# Command registry
-# -------------------------------------------------------------------
-from typing import Callable, List, Dict
-CommandFunc = Callable[[List[str]], None]
-REGISTRY: Dict[str, CommandFunc] = {}
-
-def register_command(name: str, func: CommandFunc, aliases: List[str] = []):
-    REGISTRY[name] = func
-    for a in aliases:
-        cfg["aliases"][a] = name
-
-# -------------------------------------------------------------------
-# Helpers
-# -------------------------------------------------------------------
-def split_cmd(line: str):
-    return shlex.split(line)
-
-def parse_depth_and_text(tokens: List[str], default_depth: int):
-    if tokens and tokens[-1].isdigit():
-        depth = int(tokens[-1])
-        text = " ".join(tokens[:-1]).strip()
-    else:
-        depth = default_depth
-        text = " ".join(tokens).strip()
-    return text, depth
-
-# -------------------------------------------------------------------
-# Memory snapshot & refresh
-# -------------------------------------------------------------------
-def snapshot_memory():
-    mem = MemoryManager()
-    sums_raw = mem.load_all_summaries()
-    refl_raw = mem.load_all_reflections()
-    sums = {k: (v if isinstance(v, list) else v.get("points", [])) for k, v in sums_raw.items()}
-    refl = {k: (v if isinstance(v, list) else v.get("questions", [])) for k, v in refl_raw.items()}
-    trees = {}
-    tdir = PROJECT_ROOT / "memory" / "trees"
-    if tdir.exists():
-        for fp in tdir.glob("*.json"):
-            try:
-                with open(fp, encoding="utf-8") as f:
-                    trees[fp.stem] = json.load(f)
-            except Exception:
-                traceback.print_exc()
-    return mem, sums, refl, trees
-
-MEM, SUMS, REFL, TREES = snapshot_memory()
-
-def refresh_memory():
-    global MEM, SUMS, REFL, TREES
-    MEM, SUMS, REFL, TREES = snapshot_memory()
-
-# -------------------------------------------------------------------
-# Learning helper
-# -------------------------------------------------------------------
-def save_chat(text: str):
-    mem = MemoryManager()
-    refl = Reflector()
-    builder = ReflectionTreeBuilder()
-
-    summary = [text]
-    reflections = refl.reflect_on_summary(summary)
-    tree = builder.grow_tree(reflections, layers=cfg["tree_default"])
-
-    ts = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-    name = f"chat{ts}"
-
-    mem.save_summary(name, summary, tags=["chat"])
-    mem.save_reflections(name, reflections, tags=["chat"])
-    mem.save_tree(name, tree)
-
-    print(f"\n✅ Learned & stored new chat memory: {name}\n")
-
-# -------------------------------------------------------------------
-# Built-in commands
-# -------------------------------------------------------------------
-def cmd_search(args):
-    if not args:
-        print("Usage: search [tag]")
-        return
-    tag = args[0].lower()
-    res = MEM.search_memories(tag)
-    if not res["summaries"] and not res["reflections"]:
-        print(f"⚠️  No memories tagged '{tag}'.")
-        return
-    print(f"\n🔍 Memories tagged '{tag}':")
-    for topic, data in res["summaries"].items():
-        for i, p in enumerate(data["points"], 1):
-            print(f"  [S] {topic} {i}. {p}")
-    for topic, data in res["reflections"].items():
-        for i, q in enumerate(data["questions"], 1):
-            print(f"  [R] {topic} {i}. {q}")
-
-def cmd_tree(args):
-    if not args:
-        print("Usage: tree [tag] [layers]")
-        return
-    tag, layers = parse_depth_and_text(args, cfg["tree_default"])
-    hits = MEM.search_reflections_by_tag(tag)
-    if not hits:
-        print(f"⚠️  No reflections for tag '{tag}'.")
-        return
-    builder = ReflectionTreeBuilder()
-    print(f"\n🌲 Reflection trees for '{tag}' ({layers} layers):")
-    for topic, data in hits.items():
-        print(f"\n⤷ Topic: {topic}")
-        tree = builder.grow_tree(data["questions"], layers=layers)
-        def walk(d, indent=1):
-            for parent, children in d.items():
-                print("  "*indent + f"- {parent}")
-                if children:
-                    walk({c: d.get(c, []) for c in children}, indent+1)
-        walk(tree)
-
-def cmd_simulate(args):
-    if not args:
-        print("Usage: simulate [text] [layers]")
-        return
-    text, depth = parse_depth_and_text(args, cfg["sim_default"])
-    engine = SimulationEngine(MEM, Reflector(), ReflectionTreeBuilder())
-    sim_tree = engine.simulate(text, depth=depth, tag_hint=text)
-    print(f"\n🔮 Simulation from '{text}' ({depth} layers):")
-    def walk(d, indent=0):
-        for state, outs in d.items():
-            print("  "*indent + f"> {state}")
-            for o in outs:
-                print("  "*(indent+1) + f"- {o}")
-    walk(sim_tree)
-
-def cmd_help(args):
-    print("\nCommands:")
-    for name in sorted(REGISTRY):
-        aliases = [a for a, cmd in cfg["aliases"].items() if cmd == name and a != name]
-        alias_str = f" ({', '.join(aliases)})" if aliases else ""
-        print(f"  {name}{alias_str}")
-    print()
-
-def cmd_exit(args):
-    print("🌱 Goodbye.")
-    sys.exit(0)
-
-# -------------------------------------------------------------------
-# Register built-ins
-# -------------------------------------------------------------------
-register_command("search",   cmd_search,   aliases=["s","se"])
-register_command("tree",     cmd_tree,     aliases=["t","tr"])
-register_command("simulate", cmd_simulate, aliases=["sim"])
-register_command("help",     cmd_help,     aliases=["h","?"])
-register_command("exit",     cmd_exit,     aliases=["q","quit"])
-
-# -------------------------------------------------------------------
-# Plugin auto-loader
-# -------------------------------------------------------------------
-PLUGINS_DIR = PROJECT_ROOT / "symbiont_core" / "plugins"
-if PLUGINS_DIR.exists():
-    for f in PLUGINS_DIR.glob("*.plugin.py"):
-        try:
-            spec = importlib.util.spec_from_file_location(f.stem, str(f))
-            mod = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(mod)
-            if hasattr(mod, "register"):
-                mod.register(register_command)
-        except Exception:
-            traceback.print_exc()
-
-# -------------------------------------------------------------------
-# Main loop
-# -------------------------------------------------------------------
-def main_loop():
-    print("\n🌳 Symbiont Live Chat (type 'help')\n")
-    while True:
-        try:
-            line = input("You> ").strip()
-        except (EOFError, KeyboardInterrupt):
-            print("\n(use 'exit' to quit)")
-            continue
-        if not line:
-            continue
-
-        refresh_memory()
-
-        tokens = split_cmd(line)
-        key = tokens[0].lower()
-        key = cfg["aliases"].get(key, key)
-        func = REGISTRY.get(key)
-
-        if func:
-            try:
-                func(tokens[1:])
-            except Exception:
-                traceback.print_exc()
-        else:
-            # fuzzy fallback
-            q = line.lower()
-            matches = []
-            matches += [("summary", t, p)     for t, ps in SUMS.items()  for p in ps if q in p.lower()]
-            matches += [("reflection", t, qn) for t, qs in REFL.items() for qn in qs if q in qn.lower()]
-            for t, tr in TREES.items():
-                for parent, kids in tr.items():
-                    if q in parent.lower():
-                        matches.append(("tree", t, parent))
-                    matches += [("tree", t, c) for c in kids if q in c.lower()]
-
-            if not matches:
-                opt = random.choice([
-                    f"If we probe deeper, consider: '{line}…'",
-                    f"This might hint at: '{line}…'",
-                    f"Imagine if: '{line}…'",
-                    f"Under the surface, '{line}' reveals layers."
-                ])
-                print("\nSymbiont> " + opt + "\n")
-            else:
-                kind, topic, thought = random.choice(matches)
-                print(f"\nSymbiont> Reflecting on '{topic}' ({kind}):\n  \"{thought}\"")
-                print("Symbiont> " + random.choice([
-                    f"Consider deeper: '{thought}…'",
-                    f"Could imply: '{thought}…'",
-                    f"Stretching: '{thought}…'",
-                    f"Under the surface, '{thought}'…"
-                ]) + "\n")
-
-        # prompt to learn
-        try:
-            yn = input("🌱 Learn from this? (y/N): ").strip().lower()
-        except (EOFError, KeyboardInterrupt):
-            yn = ""
-        if yn.startswith("y"):
-            save_chat(line)
-
-if __name__ == "__main__":
-    main_loop()
+# File: training_pipeline/live_chat.py
+
+"""
+Live Chat CLI for Symbiont:
+- Memory search (tag-based)
+- Reflection trees
+- What-if simulations
+- Dynamic plugin loading (imported on first use)
+- Command aliases, shlex parsing, default depths
+- Hot-reload of edited modules and plugins (--watch-code)
+- Fast start: memory snapshot loads in the background (--profile-startup)
+- Ctrl-C guard (cancels the running command)
+- Commands run as asyncio jobs; `cmd &` runs in the background (jobs, cancel)
+- Automatic learning prompt (saved by a write-behind writer)
+- Batch mode for scripts (--batch FILE|-): JSONL results, learn policy
+"""
+
+import io
+import sys
+import time
+import pathlib
+import json
+import shlex
+import random
+import functools
+import threading
+import traceback
+import contextlib
+
+STARTED = time.perf_counter()
+PROFILE = []            # (phase, seconds) for --profile-startup
+_last_mark = STARTED
+
+def _mark(phase):
+    global _last_mark
+    now = time.perf_counter()
+    PROFILE.append((phase, now - _last_mark))
+    _last_mark = now
+
+# -------------------------------------------------------------------
+# Project root path
+# -------------------------------------------------------------------
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+# -------------------------------------------------------------------
+# Optional readline for history
+# -------------------------------------------------------------------
+try:
+    import readline  # Unix
+except ImportError:
+    try:
+        import pyreadline3 as readline  # Windows
+    except ImportError:
+        readline = None
+_mark("stdlib & readline")
+
+# -------------------------------------------------------------------
+# Import core modules (once; CodeReloader reloads the ones edited later)
+# -------------------------------------------------------------------
+import symbiont_core.memory_manager          as _mm
+import symbiont_core.reflector.basic_reflector as _rf
+import symbiont_core.reflector.reflection_tree_builder as _rtb
+import symbiont_core.simulation_sandbox      as _ssb
+import symbiont_core.text_index              as _ti
+
+def _bind_core():
+    """(Re)bind the core classes, e.g. after their modules were reloaded."""
+    global MemoryManager, Reflector, ReflectionTreeBuilder, SimulationEngine, TextIndex
+    MemoryManager         = _mm.MemoryManager
+    Reflector             = _rf.Reflector
+    ReflectionTreeBuilder = _rtb.ReflectionTreeBuilder
+    SimulationEngine      = _ssb.SimulationEngine
+    TextIndex             = _ti.TextIndex
+
+_bind_core()
+
+from symbiont_core.memory_snapshot import MemorySnapshot, memory_sources
+from symbiont_core.storage import SUMMARY, REFLECTIONS, normalize_record
+from symbiont_core.simulation_cache import SimulationCache
+_mark("core modules")
+
+# -------------------------------------------------------------------
+# Load config (handle BOM)
+# -------------------------------------------------------------------
+cfg = {
+    "tree_default": 2,
+    "sim_default": 3,
+    "sim_beam_width": 8,
+    "sim_max_nodes": 2000,
+    "sim_deadline": 5.0,
+    "sim_cache_entries": 128,
+    "sim_cache_disk_mb": 0,
+    "watch_memory": False,
+    "tree_max_lines": 500,
+    "lazy_plugins": True,
+    "background_snapshot": True,
+    "watch_code": False,
+    "batch_learn": "never",
+    "batch_refresh_interval": 1.0,
+    "job_workers": 4,
+    "learn_durability": "exit",
+    "aliases": {
+        "s":    "search", "se": "search",
+        "t":    "tree",   "tr": "tree",
+        "sim":  "simulate",
+        "h":    "help",   "?":  "help",
+        "q":    "exit",   "quit":"exit"
+    }
+}
+config_path = PROJECT_ROOT / "config" / "settings.json"
+if config_path.exists():
+    try:
+        with open(config_path, encoding="utf-8-sig") as f:
+            cfg.update(json.load(f))
+    except Exception:
+        traceback.print_exc()
+_mark("config")
+
+# -------------------------------------------------------------------
+# Command registry
+# -------------------------------------------------------------------
+from typing import Callable, List, Dict
+CommandFunc = Callable[[List[str]], None]
+REGISTRY: Dict[str, CommandFunc] = {}
+_REGISTRY_LOCK = threading.RLock()
+
+def register_command(name: str, func: CommandFunc, aliases: List[str] = []):
+    with _REGISTRY_LOCK:
+        REGISTRY[name] = func
+        for a in aliases:
+            cfg["aliases"][a] = name
+
+def lookup_command(word: str):
+    """The function for a command name or alias, or None."""
+    with _REGISTRY_LOCK:
+        return REGISTRY.get(cfg["aliases"].get(word, word))
+
+def replace_commands(old: List[str], new):
+    """Drop the commands in `old` (and their aliases), then register `new` [(name, func, aliases)], as one step."""
+    with _REGISTRY_LOCK:
+        for name in old:
+            REGISTRY.pop(name, None)
+            for a in [a for a, cmd in cfg["aliases"].items() if cmd == name]:
+                del cfg["aliases"][a]
+        for name, func, aliases in new:
+            register_command(name, func, aliases)
+
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+def split_cmd(line: str):
+    return shlex.split(line)
+
+def parse_depth_and_text(tokens: List[str], default_depth: int):
+    if tokens and tokens[-1].isdigit():
+        depth = int(tokens[-1])
+        text = " ".join(tokens[:-1]).strip()
+    else:
+        depth = default_depth
+        text = " ".join(tokens).strip()
+    return text, depth
+
+# -------------------------------------------------------------------
+# Memory snapshot & refresh
+# -------------------------------------------------------------------
+SNAPSHOT = None
+MEM, SUMS, REFL, TREES = None, {}, {}, {}
+TEXT_INDEX = None
+SNAPSHOT_SECONDS = None
+# held while SNAPSHOT / SUMS / REFL / TREES / TEXT_INDEX are read or patched:
+# background jobs read them while the prompt thread refreshes them
+MEMORY_LOCK = threading.RLock()
+_SNAPSHOT_THREAD = None
+_SNAPSHOT_LOCK = threading.Lock()
+
+def snapshot_memory():
+    """Create the incremental snapshot and load everything once."""
+    global SNAPSHOT, MEM, SUMS, REFL, TREES, SNAPSHOT_SECONDS
+    started = time.perf_counter()
+    mem = MemoryManager()
+    snapshot = MemorySnapshot(memory_sources(mem, PROJECT_ROOT / "memory" / "trees"),
+                              watch=cfg["watch_memory"])
+    snapshot.refresh()
+    SUMS, REFL, TREES = (snapshot.data[k] for k in ("summaries", "reflections", "trees"))
+    MEM, SNAPSHOT = mem, snapshot
+    SNAPSHOT_SECONDS = time.perf_counter() - started
+    return MEM, SUMS, REFL, TREES
+
+def _load_snapshot():
+    global _SNAPSHOT_THREAD
+    try:
+        snapshot_memory()
+    except Exception:
+        traceback.print_exc()
+        with _SNAPSHOT_LOCK:
+            _SNAPSHOT_THREAD = None     # let the next ensure_snapshot() try again
+
+def start_snapshot():
+    """Load the memory snapshot in a background thread (once), so the prompt shows right away."""
+    global _SNAPSHOT_THREAD
+    with _SNAPSHOT_LOCK:
+        if SNAPSHOT is None and _SNAPSHOT_THREAD is None:
+            _SNAPSHOT_THREAD = threading.Thread(target=_load_snapshot, name="memory-snapshot",
+                                                daemon=True)
+            _SNAPSHOT_THREAD.start()
+        return _SNAPSHOT_THREAD
+
+def ensure_snapshot():
+    """Wait for the snapshot, loading it now if nothing has started it yet."""
+    if SNAPSHOT is not None:
+        return
+    thread = start_snapshot()
+    if thread is not None:
+        thread.join()
+    if SNAPSHOT is None:
+        raise RuntimeError("memory snapshot failed to load")
+
+_INDEX_KINDS = {"summaries": "summary", "reflections": "reflection", "trees": "tree"}
+
+def _index_texts(name, value):
+    if name == "trees":
+        return [n for parent, kids in value.items() for n in [parent, *kids]]
+    return value
+
+def refresh_memory():
+    """Reload only the topics that changed on disk and patch the text index."""
+    ensure_snapshot()
+    with MEMORY_LOCK:
+        changed = SNAPSHOT.refresh()
+        if TEXT_INDEX is None:
+            return
+        for name, topics in changed.items():
+            data = SNAPSHOT.data[name]
+            for t in topics:
+                if t in data:
+                    TEXT_INDEX.add(_INDEX_KINDS[name], t, _index_texts(name, data[t]))
+                else:
+                    TEXT_INDEX.remove(_INDEX_KINDS[name], t)
+
+def build_text_index(sums, refl, trees):
+    index = TextIndex()
+    for name, source in (("summaries", sums), ("reflections", refl), ("trees", trees)):
+        for t, value in source.items():
+            index.add(_INDEX_KINDS[name], t, _index_texts(name, value))
+    return index
+
+def text_index():
+    """Full-text index over the snapshot: built on first fuzzy lookup, then patched by refresh_memory."""
+    global TEXT_INDEX
+    ensure_snapshot()
+    with MEMORY_LOCK:
+        if TEXT_INDEX is None:
+            TEXT_INDEX = build_text_index(SUMS, REFL, TREES)
+    return TEXT_INDEX
+
+# -------------------------------------------------------------------
+# Learning helper
+# -------------------------------------------------------------------
+# learn_durability: "exit" = queued saves are written before the program exits,
+# "sync" = each save is written before save_chat returns, "none" = may be lost on exit
+DURABILITY = ("exit", "sync", "none")
+WRITER = None
+_WRITER_LOCK = threading.Lock()
+
+def _learned(names):
+    """Writer callback: let the next refresh pick up the committed memories."""
+    if SNAPSHOT is None and _SNAPSHOT_THREAD is None:
+        return              # nothing loaded yet; the first load reads them from disk
+    ensure_snapshot()
+    with MEMORY_LOCK:
+        SNAPSHOT.mark_dirty()
+
+def memory_writer():
+    """The write-behind writer for learned chats (started on first use)."""
+    global WRITER
+    with _WRITER_LOCK:
+        if WRITER is None:
+            if cfg["learn_durability"] not in DURABILITY:
+                raise ValueError(f"learn_durability must be one of {', '.join(DURABILITY)}")
+            from symbiont_core.memory_writer import MemoryWriter
+            WRITER = MemoryWriter(MemoryManager(), Reflector(), ReflectionTreeBuilder(),
+                                  layers=cfg["tree_default"], on_commit=_learned,
+                                  flush_at_exit=cfg["learn_durability"] != "none")
+        return WRITER
+
+def close_writer():
+    """Write out queued memories (unless learn_durability is "none") and stop the writer."""
+    global WRITER
+    with _WRITER_LOCK:
+        writer, WRITER = WRITER, None
+    if writer is not None and cfg["learn_durability"] != "none":
+        writer.close()
+
+def save_chat(text: str):
+    writer = memory_writer()
+    name = writer.submit(text, tags=["chat"])
+    if cfg["learn_durability"] == "sync":
+        writer.flush()
+        print(f"\n✅ Learned & stored new chat memory: {name}\n")
+    else:
+        print(f"\n✅ Learned new chat memory: {name} (saving in the background)\n")
+    return name
+
+# -------------------------------------------------------------------
+# Built-in commands
+# -------------------------------------------------------------------
+def cmd_search(args):
+    if not args:
+        print("Usage: search [tag] (combine: 'a b' = AND, 'a OR b', 'a -b' = NOT)")
+        return
+    tag = " ".join(args).lower()
+    # topics from the tag index; their text from the snapshot (refreshed before
+    # each command) instead of re-reading every matching record
+    res = {}
+    for label, kind, field, cached in (("S", SUMMARY, "points", SUMS),
+                                       ("R", REFLECTIONS, "questions", REFL)):
+        for topic in sorted(MEM.find_topics(tag, kind)):
+            with MEMORY_LOCK:
+                items = cached.get(topic)
+            if items is None:
+                data = MEM.backend.load(kind, topic)
+                if data is None:
+                    continue
+                items = normalize_record(kind, data)[field]
+            res[(label, topic)] = items
+    if not res:
+        print(f"⚠️  No memories tagged '{tag}'.")
+        return
+    print(f"\n🔍 Memories tagged '{tag}':")
+    for (label, topic), items in res.items():
+        for i, text in enumerate(items, 1):
+            print(f"  [{label}] {topic} {i}. {text}")
+
+def cmd_tree(args):
+    if not args:
+        print("Usage: tree [tag] [layers]")
+        return
+    tag, layers = parse_depth_and_text(args, cfg["tree_default"])
+    hits = MEM.search_reflections_by_tag(tag)
+    if not hits:
+        print(f"⚠️  No reflections for tag '{tag}'.")
+        return
+    builder = ReflectionTreeBuilder()
+    budget = cfg["tree_max_lines"]
+    print(f"\n🌲 Reflection trees for '{tag}' ({layers} layers):")
+    for topic, data in hits.items():
+        print(f"\n⤷ Topic: {topic}")
+        # expanded lazily, depth-first, so deep trees print right away
+        tree = builder.lazy_tree(data["questions"], layers=layers)
+        for node in tree.iter_dfs(max_nodes=budget):
+            print("  "*(node.depth+1) + f"- {node.text}")
+        if tree.truncated:
+            print(f"  … stopped after {budget} lines (tree_max_lines)")
+
+# results survive across commands; keys carry the memory version they were built from
+SIM_CACHE = SimulationCache(cfg["sim_cache_entries"], _mm.MEMORY_ROOT / "sim_cache",
+                            int(cfg["sim_cache_disk_mb"] * 1024 * 1024))
+
+def cmd_simulate(args):
+    if not args:
+        print("Usage: simulate [text] [layers]")
+        return
+    text, depth = parse_depth_and_text(args, cfg["sim_default"])
+    engine = SimulationEngine(MEM, Reflector(), ReflectionTreeBuilder(), cache=SIM_CACHE)
+    # bounded: best-scoring states per level, within a node and time budget
+    result = engine.simulate_bounded(text, depth=depth, tag_hint=text,
+                                     beam_width=cfg["sim_beam_width"],
+                                     max_nodes=cfg["sim_max_nodes"],
+                                     deadline=cfg["sim_deadline"])
+    sim_tree = result.tree
+    print(f"\n🔮 Simulation from '{text}' ({depth} layers):")
+    def walk(d, indent=0):
+        for state, outs in d.items():
+            print("  "*indent + f"> {state}")
+            for o in outs:
+                print("  "*(indent+1) + f"- {o}")
+    walk(sim_tree)
+    stats = result.stats()
+    if stats["pruned"] or stats["stopped"]:
+        stop = f", stopped at {stats['stopped']}" if stats["stopped"] else ""
+        print(f"  … {stats['nodes']} states kept, {stats['expanded']} expanded, "
+              f"{stats['pruned']} pruned{stop}")
+
+def cmd_help(args):
+    print("\nCommands:")
+    for name in sorted(REGISTRY):
+        aliases = [a for a, cmd in cfg["aliases"].items() if cmd == name and a != name]
+        alias_str = f" ({', '.join(aliases)})" if aliases else ""
+        print(f"  {name}{alias_str}")
+    print()
+
+def cmd_jobs(args):
+    running = RUNNER.running() if RUNNER else []
+    if not running:
+        print("No background jobs.")
+        return
+    for job in running:
+        where = "background" if job.background else "foreground"
+        print(f"  [{job.id}] {where} {job.seconds:6.1f}s  {job.line}")
+
+def cmd_cancel(args):
+    if not args or not args[0].lstrip("%").isdigit():
+        print("Usage: cancel [job id]  (see 'jobs')")
+        return
+    job_id = int(args[0].lstrip("%"))
+    if RUNNER and RUNNER.cancel(job_id):
+        print(f"⏹️  Cancelling job [{job_id}].")
+    else:
+        print(f"⚠️  No running job [{job_id}].")
+
+def cmd_exit(args):
+    if RUNNER:
+        RUNNER.shutdown()
+    close_writer()
+    print("🌱 Goodbye.")
+    sys.exit(0)
+
+# -------------------------------------------------------------------
+# Register built-ins
+# -------------------------------------------------------------------
+register_command("search",   cmd_search,   aliases=["s","se"])
+register_command("tree",     cmd_tree,     aliases=["t","tr"])
+register_command("simulate", cmd_simulate, aliases=["sim"])
+register_command("help",     cmd_help,     aliases=["h","?"])
+register_command("jobs",     cmd_jobs)
+register_command("cancel",   cmd_cancel,   aliases=["kill"])
+register_command("exit",     cmd_exit,     aliases=["q","quit"])
+_mark("built-in commands")
+
+# -------------------------------------------------------------------
+# Plugin auto-loader: plugins with a `# @command` header are registered
+# as stubs and imported on first use (they share one pooled HTTP client)
+# -------------------------------------------------------------------
+from symbiont_core.plugins import LazyPlugin, load_plugin_file, read_manifest
+PLUGINS_DIR = PROJECT_ROOT / "symbiont_core" / "plugins"
+PLUGINS = {}    # file stem -> (LazyPlugin or module, names of the commands it registered)
+
+def load_plugin(path: pathlib.Path, lazy: bool = False):
+    """
+    (Re)load one plugin file and swap its commands in REGISTRY in one
+    step. With `lazy` (startup) a plugin with a header gets stubs; a
+    reload imports the new code first, so if it fails the old commands
+    stay. A deleted file takes its commands with it.
+    """
+    names = []      # every command the plugin registers, stubs and real ones
+    def record(name, func, aliases=[]):
+        if name not in names:
+            names.append(name)
+        register_command(name, func, aliases)
+
+    entries = []
+    manifest = read_manifest(path) if lazy and path.exists() else []
+    if manifest:
+        plugin = LazyPlugin(path, record)
+        entries = [(name, plugin.stub(name), aliases) for name, aliases in manifest]
+    elif path.exists():
+        plugin = load_plugin_file(path, lambda name, func, aliases=[]: entries.append((name, func, aliases)))
+    else:
+        plugin = None
+    with _REGISTRY_LOCK:
+        _, old = PLUGINS.pop(path.stem, (None, []))
+        replace_commands(old, entries)
+        if plugin is not None:
+            names.extend(name for name, _, _ in entries)
+            PLUGINS[path.stem] = (plugin, names)
+
+for f in sorted(PLUGINS_DIR.glob("*.plugin.py")):
+    try:
+        load_plugin(f, lazy=cfg["lazy_plugins"])
+    except Exception:
+        traceback.print_exc()
+_mark(f"plugins ({len(PLUGINS)} files)")
+
+# -------------------------------------------------------------------
+# Code hot-reload: only edited modules and plugins, between commands
+# -------------------------------------------------------------------
+RELOADER = None
+
+def watch_code():
+    """Start watching symbiont_core/ (plugins included) for edits."""
+    global RELOADER
+    if RELOADER is None:
+        from symbiont_core.code_reloader import CodeReloader
+        RELOADER = CodeReloader(PROJECT_ROOT / "symbiont_core", load_plugin)
+    return RELOADER
+
+def reload_code():
+    """Apply pending code edits; called before each command."""
+    if RELOADER is None:
+        return
+    reloaded = RELOADER.check()
+    if reloaded:
+        _bind_core()
+        close_writer()      # the next save starts a writer with the reloaded classes
+        print(f"🔄 Reloaded: {', '.join(reloaded)}")
+
+STARTUP_SECONDS = time.perf_counter() - STARTED
+
+def print_startup_profile():
+    """Time spent in each startup phase, then the (background) memory snapshot."""
+    print("\n⏱️  Startup profile:")
+    for phase, seconds in PROFILE:
+        print(f"  {phase:<32} {seconds * 1000:8.1f} ms")
+    print(f"  {'ready for input':<32} {STARTUP_SECONDS * 1000:8.1f} ms")
+    try:
+        ensure_snapshot()
+    except RuntimeError as e:
+        print(f"  ⚠️  {e}")
+        return
+    topics = sum(len(SNAPSHOT.data[k]) for k in SNAPSHOT.data)
+    mode = "background" if cfg["background_snapshot"] else "on first use"
+    print(f"  {'memory snapshot (' + mode + ')':<32} {SNAPSHOT_SECONDS * 1000:8.1f} ms  ({topics} topics)")
+
+# -------------------------------------------------------------------
+# Main loop
+# -------------------------------------------------------------------
+def respond(line: str):
+    """Fuzzy fallback for input that is not a command: reflect on the closest memory."""
+    index = text_index()
+    with MEMORY_LOCK:
+        matches = index.sample(line)
+
+    if not matches:
+        opt = random.choice([
+            f"If we probe deeper, consider: '{line}…'",
+            f"This might hint at: '{line}…'",
+            f"Imagine if: '{line}…'",
+            f"Under the surface, '{line}' reveals layers."
+        ])
+        print("\nSymbiont> " + opt + "\n")
+    else:
+        kind, topic, thought = matches[0]
+        print(f"\nSymbiont> Reflecting on '{topic}' ({kind}):\n  \"{thought}\"")
+        print("Symbiont> " + random.choice([
+            f"Consider deeper: '{thought}…'",
+            f"Could imply: '{thought}…'",
+            f"Stretching: '{thought}…'",
+            f"Under the surface, '{thought}'…"
+        ]) + "\n")
+
+def dispatch(line: str, refresh: bool = True):
+    """
+    Run one input line: a registered command, or the fuzzy fallback.
+    Returns {"command": name or None, "status": "ok" | "fallback" | "error",
+    "error": message or None}. Command errors are printed, not raised.
+    `refresh` applies pending code edits and memory changes first.
+    """
+    if refresh:
+        reload_code()
+        refresh_memory()
+    try:
+        tokens = split_cmd(line)
+    except ValueError as e:         # unbalanced quotes
+        print(f"⚠️  {e}")
+        return {"command": None, "status": "error", "error": str(e)}
+
+    word = tokens[0].lower()
+    func = lookup_command(word)
+    if func is None:
+        respond(line)
+        return {"command": None, "status": "fallback", "error": None}
+    command = cfg["aliases"].get(word, word)
+    try:
+        outcome = func(tokens[1:])
+        if hasattr(outcome, "__await__"):
+            # a coroutine command reached through a lazy-plugin stub, or from batch mode
+            import asyncio
+            asyncio.run(outcome)
+    except Exception as e:
+        traceback.print_exc()
+        return {"command": command, "status": "error", "error": str(e) or e.__class__.__name__}
+    return {"command": command, "status": "ok", "error": None}
+
+# -------------------------------------------------------------------
+# Jobs: commands run on an asyncio loop in the background so the prompt
+# never blocks; a trailing '&' leaves a command running in the background
+# -------------------------------------------------------------------
+RUNNER = None
+OUTPUT = None
+_jobs = None
+INLINE_COMMANDS = {"help", "jobs", "cancel", "exit"}     # instant; run on the prompt thread
+
+def _job_finished(job):
+    if not job.background:
+        return
+    failed = job.state == "failed" or (job.result or {}).get("status") == "error"
+    status = "⏹️  cancelled" if job.state == "cancelled" else "⚠️  failed" if failed else "✅ done"
+    OUTPUT.announce(f"\n[{job.id}] {status} ({job.seconds:.1f}s): {job.line}\n"
+                    f"{job.output.getvalue()}\n")
+
+def start_jobs():
+    """Start the job loop and route job output through ThreadOutput (once)."""
+    global RUNNER, OUTPUT, _jobs
+    if RUNNER is None:
+        from symbiont_core import jobs as _jobs
+        lock = threading.RLock()
+        OUTPUT = sys.stdout = _jobs.ThreadOutput(sys.stdout, lock)
+        sys.stderr = _jobs.ThreadOutput(sys.stderr, lock)
+        RUNNER = _jobs.JobRunner(cfg["job_workers"], on_finish=_job_finished)
+    return RUNNER
+
+def run_line(line: str):
+    """
+    Run one prompt line as a job. With a trailing '&' it runs in the
+    background and its output is shown when it finishes; otherwise wait
+    for it (Ctrl-C cancels it). Returns dispatch()'s result, or None if
+    the command was backgrounded or cancelled.
+    """
+    background = line.endswith("&")
+    if background:
+        line = line[:-1].rstrip()
+        if not line:
+            return None
+    reload_code()
+    refresh_memory()
+    try:
+        tokens = split_cmd(line)
+    except ValueError:
+        tokens = []
+    word = tokens[0].lower() if tokens else ""
+    func = lookup_command(word)
+    if cfg["aliases"].get(word, word) in INLINE_COMMANDS:
+        return dispatch(line, refresh=False)
+
+    start_jobs()
+    if func is not None and _jobs.is_async(func):
+        target = functools.partial(func, tokens[1:])
+    else:
+        target = lambda: dispatch(line, refresh=False)
+    job = RUNNER.create(line, background=background)
+    if background:
+        # before the job is scheduled, so its "done" line cannot come first
+        print(f"[{job.id}] started in the background: {line}")
+    RUNNER.start(job, target)
+    if background:
+        return None
+    try:
+        while not job.wait(0.25):       # short waits keep Ctrl-C responsive on Windows
+            pass
+    except KeyboardInterrupt:
+        RUNNER.cancel(job.id)
+        print("\n⏹️  Cancelled.")
+        return None
+    if job.state == "failed":
+        print(f"⚠️  {job.error}")
+    return job.result if job.state == "done" else None
+
+def ask(prompt: str):
+    """input() that lets finishing background jobs print above the prompt."""
+    if OUTPUT:
+        OUTPUT.prompt = prompt
+    try:
+        return input(prompt)
+    finally:
+        if OUTPUT:
+            OUTPUT.prompt = None
+
+def main_loop(profile=False):
+    if cfg["watch_code"]:
+        watch_code()
+    if cfg["background_snapshot"]:
+        start_snapshot()
+    if profile:
+        print_startup_profile()
+    print(f"\n🌳 Symbiont Live Chat (type 'help') — ready in {STARTUP_SECONDS:.2f}s\n")
+    while True:
+        try:
+            line = ask("You> ").strip()
+        except (EOFError, KeyboardInterrupt):
+            if not sys.stdin.isatty():
+                # piped input ran out; see --batch for scripted use
+                cmd_exit([])
+            print("\n(use 'exit' to quit)")
+            continue
+        if not line:
+            continue
+
+        if run_line(line) is None:
+            continue
+
+        # prompt to learn
+        try:
+            yn = ask("🌱 Learn from this? (y/N): ").strip().lower()
+        except (EOFError, KeyboardInterrupt):
+            yn = ""
+        if yn.startswith("y"):
+            save_chat(line)
+
+# -------------------------------------------------------------------
+# Batch mode: commands from a file or pipe, one JSONL result per line
+# -------------------------------------------------------------------
+LEARN_POLICIES = ("never", "always", "fallback")
+
+def run_batch(lines, results=None, learn=None, refresh_interval=None):
+    """
+    Run `lines` through dispatch() without prompts. Blank lines and
+    `#` comments are skipped; `exit` ends the batch. For each command a
+    JSON line goes to `results` (default stdout) with its captured
+    output and time in ms. `learn` ("never", "always", or "fallback" =
+    only lines that were not commands) decides what gets save_chat'ed.
+    Memory is re-checked for outside changes at most every
+    `refresh_interval` seconds, and right after this batch learns.
+    Returns {"commands", "errors", "learned", "seconds"}.
+    """
+    results = results or sys.stdout
+    learn = learn or cfg["batch_learn"]
+    if learn not in LEARN_POLICIES:
+        raise ValueError(f"learn policy must be one of {', '.join(LEARN_POLICIES)}")
+    interval = cfg["batch_refresh_interval"] if refresh_interval is None else refresh_interval
+    summary = {"commands": 0, "errors": 0, "learned": 0, "seconds": 0.0}
+    started = last_refresh = time.perf_counter()
+    refresh_memory()
+
+    for n, raw in enumerate(lines, 1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        t0 = time.perf_counter()
+        refresh = t0 - last_refresh >= interval
+        if refresh:
+            last_refresh = t0
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            try:
+                result = dispatch(line, refresh=refresh)
+            except SystemExit:
+                result = {"command": "exit", "status": "exit", "error": None}
+            learned = None
+            if result["status"] != "exit" and (
+                    learn == "always" or (learn == "fallback" and result["status"] == "fallback")):
+                learned = save_chat(line)
+                last_refresh = t0 - interval        # pick the new memory up once it is committed
+        record = {"n": n, "line": line, **result, "learned": learned,
+                  "ms": round((time.perf_counter() - t0) * 1000, 3), "output": out.getvalue()}
+        results.write(json.dumps(record, ensure_ascii=False) + "\n")
+        summary["commands"] += 1
+        summary["errors"] += result["status"] == "error"
+        summary["learned"] += learned is not None
+        if result["status"] == "exit":
+            break
+    results.flush()
+    if WRITER is not None:
+        WRITER.flush()
+    summary["seconds"] = time.perf_counter() - started
+    return summary
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Symbiont live chat.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each import and load phase took")
+    parser.add_argument("--watch-code", action="store_true",
+                        help="reload edited symbiont_core modules and plugins between commands")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run commands from FILE ('-' for stdin) without prompts; JSONL results")
+    parser.add_argument("--learn", choices=LEARN_POLICIES, default=None,
+                        help="batch learn policy (default: batch_learn setting, 'never')")
+    parser.add_argument("--results", metavar="PATH", help="write batch JSONL here instead of stdout")
+    args = parser.parse_args()
+    cfg["watch_code"] = cfg["watch_code"] or args.watch_code
+    if args.batch:
+        source = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8-sig")
+        sink = open(args.results, "w", encoding="utf-8") if args.results else sys.stdout
+        try:
+            stats = run_batch(source, sink, learn=args.learn)
+        finally:
+            for f in (source, sink):
+                if f not in (sys.stdin, sys.stdout):
+                    f.close()
+        rate = stats["commands"] / stats["seconds"] if stats["seconds"] else 0.0
+        print(f"✅ {stats['commands']} commands in {stats['seconds']:.2f}s ({rate:.0f}/s), "
+              f"{stats['errors']} errors, {stats['learned']} learned", file=sys.stderr)
+        sys.exit(1 if stats["errors"] else 0)
+    main_loop(profile=args.profile_startup)
@@ -0,0 +1,67 @@
+"""
+Minimal UCI engine for exercising the engine pool and batch analysis
+without Stockfish. It plays the alphabetically first legal move and
+scores positions by ply count; `go` optionally sleeps STUB_UCI_DELAY
+seconds to mimic search time. With STUB_UCI_CRASH_AFTER=N the engine
+exits without answering its (N+1)th `go`, like a crashed Stockfish.
+
+    "STOCKFISH_PATH": ["python", "training_pipeline/stub_uci_engine.py"]
+"""
+import os
+import sys
+import time
+
+import chess
+
+def main():
+    board = chess.Board()
+    multipv = 1
+    delay = float(os.environ.get("STUB_UCI_DELAY", "0"))
+    crash_after = int(os.environ.get("STUB_UCI_CRASH_AFTER", "0")) or None
+    searches = 0
+
+    def send(line):
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+    for raw in sys.stdin:
+        parts = raw.split()
+        if not parts:
+            continue
+        cmd = parts[0]
+        if cmd == "uci":
+            send("id name StubUCI")
+            send("option name Hash type spin default 16 min 1 max 4096")
+            send("option name Threads type spin default 1 min 1 max 256")
+            send("option name MultiPV type spin default 1 min 1 max 50")
+            send("uciok")
+        elif cmd == "isready":
+            send("readyok")
+        elif cmd == "setoption" and "MultiPV" in parts:
+            multipv = int(parts[-1])
+        elif cmd == "ucinewgame":
+            board = chess.Board()
+        elif cmd == "position":
+            moves_at = parts.index("moves") if "moves" in parts else len(parts)
+            board = chess.Board() if parts[1] == "startpos" else chess.Board(" ".join(parts[2:moves_at]))
+            for move in parts[moves_at + 1:]:
+                board.push_uci(move)
+        elif cmd == "go":
+            depth = int(parts[parts.index("depth") + 1]) if "depth" in parts else 1
+            if crash_after is not None and searches >= crash_after:
+                sys.exit(1)
+            searches += 1
+            time.sleep(delay)
+            moves = sorted(m.uci() for m in board.legal_moves)
+            if not moves:
+                send(f"info depth {depth} score mate 0")
+                send("bestmove (none)")
+                continue
+            for n, move in enumerate(moves[:multipv], 1):
+                send(f"info depth {depth} multipv {n} score cp {board.ply() * 5 - 20 * n} pv {move}")
+            send(f"bestmove {moves[0]}")
+        elif cmd == "quit":
+            break
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import pathlib
+import tempfile
+
+# --- Setup paths (same as ingest.py)
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from symbiont_core.batch_analysis import iter_positions, analyse_batch, BatchReport
+from symbiont_core.engine_pool import EnginePool, uci_factory
+from symbiont_core.eval_cache import EvalCache
+
+STUB = [sys.executable, str(pathlib.Path(__file__).resolve().parent / "stub_uci_engine.py")]
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+E4    = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+FENS  = [
+    "# start position twice (clocks differ), one after 1.e4, one broken",
+    START,
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 4 3",
+    E4,
+    "not a fen",
+]
+
+def run(pool, fens_file, out=None, cache=None):
+    report = BatchReport()
+    results = list(analyse_batch(pool, iter_positions(fens_file), depth=3,
+                                 out_path=out, report=report, cache=cache))
+    return report, {r["fen"]: r for r in results}
+
+def test_batch_analysis():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = pathlib.Path(tmp)
+        fens_file = tmp / "fens.txt"
+        fens_file.write_text("\n".join(FENS) + "\n", encoding="utf-8")
+        out = tmp / "analysis.jsonl"
+        cache = EvalCache(tmp / "evals.sqlite")
+        pool = EnginePool(uci_factory(STUB), size=2)
+        try:
+            print("\n♟️  First run against the stub engine")
+            report, results = run(pool, fens_file, out, cache)
+            assert (report.positions, report.unique) == (4, 3)
+            assert (report.analysed, report.failed, report.cached) == (2, 1, 0)
+            assert results[START]["count"] == 2
+            assert results[START]["best"] == "a2a3"
+            assert results[E4]["lines"][0]["depth"] == 3
+            assert "error" in results["not a fen"]
+
+            records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+            assert sorted(r["fen"] for r in records) == sorted(results)
+
+            print("🗄️  Second run from the evaluation cache")
+            report, results = run(pool, fens_file, cache=cache)
+            assert (report.analysed, report.cached, report.failed) == (2, 2, 1)
+            assert results[START]["cached"] and results[E4]["cached"]
+        finally:
+            pool.close()
+            cache.close()
+
+        print("💥 Engines that crash are replaced")
+        os.environ["STUB_UCI_CRASH_AFTER"] = "1"
+        try:
+            pool = EnginePool(uci_factory(STUB), size=1)
+            report, results = run(pool, fens_file)
+        finally:
+            del os.environ["STUB_UCI_CRASH_AFTER"]
+            pool.close()
+        assert (report.analysed, report.failed) == (2, 1)
+        assert pool.restarts == 1
+
+    print("\n✅ Batch analysis test complete.\n")
+
+if __name__ == '__main__':
+    test_batch_analysis()
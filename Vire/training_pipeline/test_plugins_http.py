@@ -0,0 +1,113 @@
+import io
+import sys
+import json
+import pathlib
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Setup paths (same as ingest.py)
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from symbiont_core.http_client import HttpClient, PooledTransport, RedirectTransport
+from symbiont_core.response_cache import ResponseCache
+from symbiont_core.plugins import load_plugin_file
+
+PLUGINS_DIR = pathlib.Path(__file__).resolve().parents[1] / "symbiont_core" / "plugins"
+
+# canned API answers by path: (status, JSON body)
+ROUTES = {
+    "/v1/convert":                       (200, {"success": True, "result": 9.2, "info": {"rate": 0.92}}),
+    "/convert":                          (200, {"result": 9.2, "info": {"rate": 0.92}}),
+    "/api/v3/simple/price":              (200, {"bitcoin": {"usd": 50000}}),
+    "/api/v2/entries/en/chess":          (200, [{"word": "chess", "meanings": [{"partOfSpeech": "noun",
+                                                 "definitions": [{"definition": "A board game."}]}]}]),
+    "/random_joke":                      (200, {"setup": "Why?", "punchline": "Because."}),
+    "/api/cloud-eval":                   (200, {"depth": 20, "pvs": [{"moves": "e2e4 e7e5", "cp": 30}]}),
+    "/v2/top-headlines":                 (200, {"status": "ok", "articles": [{"title": "Headline",
+                                                 "source": {"name": "Wire"}}]}),
+    "/data/2.5/weather":                 (200, {"cod": 200, "name": "London", "weather": [{"description": "light rain"}],
+                                                "main": {"temp": 11, "feels_like": 9, "humidity": 80}}),
+    "/api/rest_v1/page/summary/Chess":   (200, {"title": "Chess", "extract": "A board game."}),
+}
+
+class StandIn(BaseHTTPRequestHandler):
+    hits = {}
+
+    def reply(self, status, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        StandIn.hits[path] = StandIn.hits.get(path, 0) + 1
+        self.reply(*ROUTES.get(path, (404, {"title": "Not found"})))
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.reply(200, {"translatedText": f"[{payload['target']}] {payload['q']}"})
+
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run(commands, line):
+    name, *args = line.split()
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        commands[name](args)
+    return out.getvalue()
+
+def test_plugins_http():
+    server = start_server()
+    now = [1_000_000.0]
+    transport = RedirectTransport(f"http://127.0.0.1:{server.server_port}", PooledTransport(proxies={}))
+    client = HttpClient(transport, cache=ResponseCache(clock=lambda: now[0]))
+    commands = {}
+    for f in sorted(PLUGINS_DIR.glob("*.plugin.py")):
+        mod = load_plugin_file(f, lambda name, func, aliases=[]: commands.__setitem__(name, func), client)
+        if f.stem == "lichess_eval.plugin":
+            mod.get_eval_cache = lambda: None     # keep the test out of memory/
+    try:
+        print("\n🌐 Network plugins against a local stand-in server")
+        assert "10.0 USD = 9.2000 EUR" in run(commands, "convert 10 usd eur")
+        assert "Bitcoin → USD: 50000" in run(commands, "crypto bitcoin usd")
+        assert "A board game." in run(commands, "define chess")
+        assert "No definition found" in run(commands, "define zzzz")
+        assert "Because." in run(commands, "joke")
+        assert "Move: e2e4    Eval: 0.30" in run(commands, "lichess")
+        assert "Headline  (Wire)" in run(commands, "news")
+        assert "[es] Hello world" in run(commands, "translate Hello world es")
+        assert "Weather in London: Light rain" in run(commands, "weather London,uk")
+        assert "A board game." in run(commands, "wiki Chess")
+        hosts = {url.split("/")[2] for _, url in transport.requests}
+        assert "en.wikipedia.org" in hosts and ("POST", "https://libretranslate.de/translate") in transport.requests
+
+        print("🗄️  Cached responses: TTL hit, then stale-if-error")
+        assert "A board game." in run(commands, "wiki Chess")
+        assert StandIn.hits["/api/rest_v1/page/summary/Chess"] == 1
+        assert client.cache.counters["hits"] == 1
+
+        server.shutdown()
+        server.server_close()
+        now[0] += 30 * 24 * 3600        # past ttl + stale window
+        assert "A board game." in run(commands, "wiki Chess")
+        assert client.cache.counters["stale_if_error"] == 1
+        assert "Error fetching joke" in run(commands, "joke")   # uncached: the failure shows
+    finally:
+        server.shutdown()
+        server.server_close()
+        client.close()
+
+    print("\n✅ Plugin HTTP test complete.\n")
+
+if __name__ == '__main__':
+    test_plugins_http()